@@ -23,122 +23,261 @@ Game header details (White, Black, Date, Opening, Result) are included in the gr
 
 Dependencies:
   - positional_graph.py (contains the PositionalGraph class and helper functions such as get_zone)
-  - python-chess, networkx, numpy, math, plotly, os, sys
+  - python-chess, networkx, numpy, scipy, math, plotly, os, sys
 """
 
 import os
 import sys
 import math
+import itertools
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 import networkx as nx
 import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from scipy.sparse import csr_array
+from scipy.sparse.csgraph import connected_components, laplacian, shortest_path
+from scipy.sparse.linalg import eigsh
 import chess
 import chess.pgn
 
 # Import the PositionalGraph class and get_zone from positional_graph.py
 from positional_graph import PositionalGraph, get_zone
 
+# === CSR REPRESENTATION OF INFLUENCE GRAPHS ===
+
+def influence_to_csr(graph):
+    """
+    Convert an influence graph into a symmetric SciPy CSR adjacency matrix (edge weights as data)
+    plus per-node arrays, so that all metrics work on contiguous arrays instead of NetworkX dicts.
+    Returns (csr, node_labels, node_types, node_squares), where node_squares holds the board square
+    of square nodes and pawn nodes (attribute 'square') and None for any other node.
+    """
+    node_labels = []
+    node_types = []
+    node_squares = []
+    for node, data in graph.nodes(data=True):
+        node_type = data.get("type")
+        node_labels.append(node)
+        node_types.append(node_type)
+        if node_type == "square":
+            node_squares.append(node)
+        elif node_type == "pawn":
+            node_squares.append(data.get("square"))
+        else:
+            node_squares.append(None)
+    csr = nx.to_scipy_sparse_array(graph, nodelist=node_labels, weight="weight", format="csr")
+    return csr, node_labels, np.array(node_types, dtype=object), np.array(node_squares, dtype=object)
+
 # === HELPER FUNCTIONS FOR DISCONNECTED GRAPH METRICS ===
+# Each graph's CSR matrix is permuted once so that nodes of the same connected component are contiguous.
+# Per-node quantities (hop distances, harmonic centrality, clustering, Laplacian) are then computed once
+# for the whole graph, and each component reads them through slice views without copying: inter-component
+# distances are infinite, so every one of them is component-local.
 
-def get_connected_components(graph):
-    """Return a list of subgraphs corresponding to each connected component."""
-    return [graph.subgraph(c).copy() for c in nx.connected_components(graph)]
+def get_connected_components(csr):
+    """
+    Group the nodes of a CSR graph by connected component.
+    Returns (order, components): order is a permutation of node indices that sorts nodes by component,
+    and components is a list of slices into that order, one per component.
+    """
+    if csr.shape[0] == 0:
+        return np.zeros(0, dtype=np.int64), []
+    n_components, labels = connected_components(csr, directed=False, return_labels=True)
+    order = np.argsort(labels, kind="stable")
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(labels, minlength=n_components))))
+    return order, [slice(start, stop) for start, stop in zip(bounds[:-1].tolist(), bounds[1:].tolist())]
 
-def compute_components_entropy(graph):
-    """Compute the entropy of component sizes for the given graph."""
-    components = get_connected_components(graph)
-    sizes = [comp.number_of_nodes() for comp in components]
-    N = sum(sizes)
+def compute_components_entropy(components):
+    """Compute the entropy of component sizes for the given list of components."""
+    sizes = np.fromiter((block.stop - block.start for block in components), dtype=np.float64, count=len(components))
+    N = sizes.sum()
     if N == 0:
         return None
-    return -sum((s / N) * math.log(s / N) for s in sizes if s > 0)
+    p = sizes / N  # components are never empty, so p > 0
+    return float(-(p * np.log(p)).sum())
+
+def compute_hop_distances(csr):
+    """Return the all-pairs unweighted shortest path (hop count) matrix; unreachable pairs are inf."""
+    return shortest_path(csr, directed=False, unweighted=True)
+
+def compute_harmonic_centrality(distances):
+    """Return the harmonic centrality of every node (sum of inverse hop distances to all other nodes)."""
+    with np.errstate(divide="ignore"):
+        inverse = 1.0 / distances
+    np.fill_diagonal(inverse, 0.0)
+    return inverse.sum(axis=1)
 
-def compute_harmonic_centrality_variance(graph):
+def compute_harmonic_centrality_variance(harmonic):
     """Compute the variance of harmonic centrality scores over all nodes."""
-    centrality = nx.harmonic_centrality(graph)
-    values = np.array(list(centrality.values()))
-    if len(values) == 0:
+    if len(harmonic) == 0:
         return None
-    return float(np.var(values))
+    return float(np.var(harmonic))
+
+def compute_node_clustering(csr):
+    """
+    Compute each node's weighted clustering coefficient on the raw (unnormalized) edge weights, using
+    NetworkX's definition: the geometric mean of the triangle edge weights over deg * (deg - 1).
+    Dividing by a component's maximum edge weight gives NetworkX's normalized value for that component.
+    With C the element-wise cube root of the adjacency matrix, node i's triangle sum is (C @ C .* C) summed
+    over row i, so the whole vector comes from one sparse matrix product.
+    """
+    cube_root = csr.power(1.0 / 3.0)
+    triangles = np.asarray((cube_root @ cube_root).multiply(cube_root).sum(axis=1)).ravel()
+    degree = np.diff(csr.indptr)
+    pairs = degree * (degree - 1)
+    clustering = np.zeros(csr.shape[0])
+    np.divide(triangles, pairs, out=clustering, where=pairs > 0)
+    return clustering
+
+def compute_eccentricity(distances):
+    """Return each node's eccentricity: its largest finite hop distance (0 for isolated nodes)."""
+    if distances.size == 0:
+        return np.zeros(0)
+    return np.where(np.isinf(distances), 0.0, distances).max(axis=1)
+
+def compute_node_arrays(csr):
+    """Compute the per-node arrays shared by all component metrics of a (component-ordered) CSR graph."""
+    distances = compute_hop_distances(csr)
+    return {
+        "distances": distances,
+        "eccentricity": compute_eccentricity(distances),
+        "clustering": compute_node_clustering(csr),
+        "max_weight": csr.max(axis=1).toarray().ravel() if csr.shape[0] else np.zeros(0),
+        "laplacian": laplacian(csr).tocsr(),
+    }
+
+def compute_effective_diameter(eccentricity, block):
+    """
+    Compute the effective diameter (max shortest path length) of a connected component as the largest
+    eccentricity of its nodes. This is exact and needs no BFS beyond the shared distance matrix.
+    """
+    return int(eccentricity[block].max())
+
+def compute_laplacian_energy(csr):
+    """
+    Return the sum of squared Laplacian eigenvalues of a CSR graph. By the identity sum(lambda_i^2) =
+    sum(L_ij^2) this needs no eigendecomposition: it is O(E) on the sparse Laplacian instead of O(V^3).
+    """
+    return float(laplacian(csr).power(2).sum())
+
+# Components with at least this many nodes use the sparse eigensolver; below it a dense block is
+# both smaller than the solver's workspace and faster to decompose.
+SPARSE_FIEDLER_MIN_NODES = 200
 
-def compute_effective_diameter(component):
-    """Compute the effective diameter (max shortest path length) of a connected component."""
-    lengths = dict(nx.all_pairs_shortest_path_length(component))
-    max_length = 0
-    for u in lengths:
-        for v in lengths[u]:
-            max_length = max(max_length, lengths[u][v])
-    return max_length
+def compute_fiedler_value(L):
+    """
+    Return the Fiedler value (smallest nonzero eigenvalue) of a connected component's sparse Laplacian
+    block, or None if there is none. It is the only eigenvalue the metrics use, so small components get
+    closed forms instead of an eigendecomposition: for two nodes it is the trace (2w), and for three
+    nodes it is the smaller root of x^2 - trace * x + (sum of principal 2x2 minors) = 0.
+    Large components ask ARPACK for the two smallest eigenvalues without densifying the Laplacian.
+    """
+    n = L.shape[0]
+    if n >= SPARSE_FIEDLER_MIN_NODES:
+        for val in sorted(eigsh(L.astype(float), k=2, which="SA", return_eigenvectors=False).tolist()):
+            if val > 1e-6:
+                return float(val)
+        return None
+    L = L.toarray()
+    if n == 2:
+        fiedler = float(L[0, 0] + L[1, 1])
+        return fiedler if fiedler > 1e-6 else None
+    if n == 3:
+        trace = L[0, 0] + L[1, 1] + L[2, 2]
+        minors = (L[0, 0] * L[1, 1] - L[0, 1] ** 2 + L[0, 0] * L[2, 2] - L[0, 2] ** 2
+                  + L[1, 1] * L[2, 2] - L[1, 2] ** 2)
+        fiedler = float((trace - math.sqrt(max(trace * trace - 4.0 * minors, 0.0))) / 2.0)
+        if fiedler > 1e-6:
+            return fiedler
+    for val in sorted(np.linalg.eigvalsh(L).tolist()):
+        if val > 1e-6:
+            return val
+    return None
 
-def compute_component_metrics(component):
+def compute_component_metrics(block, node_arrays, harmonic):
     """
-    Compute key metrics for a connected component:
+    Compute key metrics for a connected component (given as a slice of the component-ordered nodes):
       - Effective diameter
       - Average harmonic centrality
       - Average clustering coefficient (weighted)
       - Fiedler value (smallest nonzero eigenvalue of the Laplacian)
       - Number of nodes
+    Isolated nodes take a fast path with their known values.
     """
-    diameter = compute_effective_diameter(component)
-    harmonic = nx.harmonic_centrality(component)
-    avg_harmonic = np.mean(list(harmonic.values())) if harmonic else None
-    avg_clustering = nx.average_clustering(component, weight="weight")
-    L = nx.laplacian_matrix(component, weight="weight").todense()
-    eigenvalues = np.linalg.eigvalsh(L)
-    fiedler = None
-    for val in sorted(eigenvalues.tolist()):
-        if val > 1e-6:
-            fiedler = val
-            break
+    if block.stop - block.start <= 1:
+        return dict(_ISOLATED_NODE_METRICS)
+    diameter = compute_effective_diameter(node_arrays["eccentricity"], block)
+    avg_harmonic = float(np.mean(harmonic[block]))
+    max_weight = node_arrays["max_weight"][block].max()
+    avg_clustering = float(np.mean(node_arrays["clustering"][block]) / max_weight) if max_weight > 0 else 0.0
+    fiedler = compute_fiedler_value(node_arrays["laplacian"][block, block])
     return {
         "diameter": diameter,
         "avg_harmonic_centrality": avg_harmonic,
         "avg_clustering": avg_clustering,
         "fiedler": fiedler,
-        "num_nodes": component.number_of_nodes()
+        "num_nodes": block.stop - block.start
     }
 
+_ISOLATED_NODE_METRICS = {"diameter": 0, "avg_harmonic_centrality": 0.0, "avg_clustering": 0.0,
+                          "fiedler": None, "num_nodes": 1}
+
+def compute_graph_component_metrics(csr):
+    """
+    Decompose a CSR graph into connected components and compute their metrics.
+    Returns (components, component_metrics, entropy, harmonic_centrality_variance).
+    A graph without edges consists of isolated nodes only, so its results are known without any
+    distance, clustering or spectral computation.
+    """
+    n = csr.shape[0]
+    if csr.nnz == 0:
+        components = [slice(i, i + 1) for i in range(n)]
+        metrics_list = [dict(_ISOLATED_NODE_METRICS) for _ in range(n)]
+        return components, metrics_list, (math.log(n) if n else None), (0.0 if n else None)
+    order, components = get_connected_components(csr)
+    node_arrays = compute_node_arrays(csr[order][:, order])
+    harmonic = compute_harmonic_centrality(node_arrays["distances"])
+    metrics_list = [compute_component_metrics(block, node_arrays, harmonic) for block in components]
+    return components, metrics_list, compute_components_entropy(components), compute_harmonic_centrality_variance(harmonic)
+
 # === ZONE AGGREGATION FUNCTIONS ===
 
-def compute_zone_subgraph(zone, influence_graph):
+def build_zone_index(node_squares, zones=("queenside", "kingside", "center")):
     """
-    Extract the subgraph of influence_graph containing only nodes that belong to the given zone.
-    Uses get_zone() on board squares (node names) and pawn nodes (attribute 'square').
+    Assign every node to its zone in a single pass and return {zone: array of node indices}.
+    Uses get_zone() on the square of each board square node and pawn node; other nodes belong to no zone.
     """
-    zone_nodes = []
-    for node, data in influence_graph.nodes(data=True):
-        if data.get("type") == "square":
-            if get_zone(node) == zone:
-                zone_nodes.append(node)
-        elif data.get("type") == "pawn":
-            sq = data.get("square")
-            if sq and get_zone(sq) == zone:
-                zone_nodes.append(node)
-    return influence_graph.subgraph(zone_nodes).copy()
+    zone_index = {zone: [] for zone in zones}
+    for i, square in enumerate(node_squares):
+        if square is not None:
+            zone = get_zone(square)
+            if zone in zone_index:
+                zone_index[zone].append(i)
+    return {zone: np.array(nodes, dtype=np.int64) for zone, nodes in zone_index.items()}
 
-def compute_zone_metrics(zone, influence_graph):
+def compute_zone_metrics(zone_nodes, csr):
     """
-    For a given zone, compute aggregated metrics:
+    For a given zone (given as the indices of its nodes), compute aggregated metrics:
       1. Extract the zone subgraph.
       2. Decompose it into connected components.
       3. Compute component metrics for each.
       4. Aggregate the metrics (weighted by component size).
       5. Compute entropy and harmonic centrality variance for the zone.
     """
-    zone_subgraph = compute_zone_subgraph(zone, influence_graph)
-    components = get_connected_components(zone_subgraph)
+    zone_subgraph = csr[zone_nodes][:, zone_nodes]
+    components, metrics_list, entropy, centrality_variance = compute_graph_component_metrics(zone_subgraph)
     if not components:
         return {"diameter": None, "avg_harmonic_centrality": None, "avg_clustering": None,
                 "fiedler": None, "total_nodes": 0, "entropy": None, "harmonic_centrality_variance": None}
-    total_nodes = sum(comp.number_of_nodes() for comp in components)
-    metrics_list = [compute_component_metrics(comp) for comp in components]
+    total_nodes = sum(block.stop - block.start for block in components)
     agg = {"total_nodes": total_nodes}
     for key in ["diameter", "avg_harmonic_centrality", "avg_clustering", "fiedler"]:
         weighted_sum = sum(m[key] * m["num_nodes"] for m in metrics_list if m[key] is not None)
         agg[key] = weighted_sum / total_nodes if total_nodes > 0 else None
-    agg["entropy"] = compute_components_entropy(zone_subgraph)
-    agg["harmonic_centrality_variance"] = compute_harmonic_centrality_variance(zone_subgraph)
+    agg["entropy"] = entropy
+    agg["harmonic_centrality_variance"] = centrality_variance
     return agg
 
 def aggregate_zone_metrics(zones_metrics):
@@ -152,48 +291,66 @@ def aggregate_zone_metrics(zones_metrics):
         global_metrics[key] = weighted_sum / total_nodes_all if total_nodes_all > 0 else None
     return global_metrics
 
-# === Helper to Compute Union Influence Graph ===
+# === Union Influence Graph with Edge Colors ===
+
+WHITE_EDGE = 1
+BLACK_EDGE = 2
 
-def union_influence_graph(pos_graph):
+def build_colored_influence_csr(pos_graph):
     """
-    Compute the union influence graph from a PositionalGraph instance by merging the white and black
-    influence subgraphs.
+    Build the union of the white and black influence graphs of a PositionalGraph as one CSR matrix,
+    together with parallel per-edge arrays, so the three colorings share one node set and one layout:
+      - edge_color: bitmask per stored edge (WHITE_EDGE | BLACK_EDGE),
+      - edge_weights: array of shape (2, nnz) with the white and black weight of each edge (0 if absent).
+    Where both colors have the same edge, the union keeps the black weight (as merging the white graph
+    and then the black graph into one NetworkX graph did). Returns (csr, edge_color, edge_weights, node_squares).
     """
-    white_inf = pos_graph.compute_influence_subgraph_by_color(chess.WHITE)
-    black_inf = pos_graph.compute_influence_subgraph_by_color(chess.BLACK)
-    union_inf = nx.Graph()
-    union_inf.add_nodes_from(white_inf.nodes(data=True))
-    union_inf.add_edges_from(white_inf.edges(data=True))
-    union_inf.add_nodes_from(black_inf.nodes(data=True))
-    union_inf.add_edges_from(black_inf.edges(data=True))
-    return union_inf
+    white_csr, node_labels, _, node_squares = influence_to_csr(
+        pos_graph.compute_influence_subgraph_by_color(chess.WHITE))
+    black_csr = nx.to_scipy_sparse_array(pos_graph.compute_influence_subgraph_by_color(chess.BLACK),
+                                         nodelist=node_labels, weight="weight", format="csr")
+    # Influence graphs have well under a hundred nodes, so combining them densely is cheap and keeps the
+    # per-edge arrays trivially aligned with the CSR storage order.
+    white_dense = white_csr.toarray()
+    black_dense = black_csr.toarray()
+    csr = csr_array(np.where(black_dense != 0, black_dense, white_dense))
+    rows = np.repeat(np.arange(csr.shape[0]), np.diff(csr.indptr))
+    cols = csr.indices
+    edge_weights = np.stack([white_dense[rows, cols], black_dense[rows, cols]])
+    edge_color = np.where(edge_weights[0] != 0, WHITE_EDGE, 0) | np.where(edge_weights[1] != 0, BLACK_EDGE, 0)
+    return csr, edge_color, edge_weights, node_squares
+
+def color_subgraph(csr, edge_color, edge_weights, color_bit):
+    """Return the CSR graph of the edges carrying color_bit, weighted with that color's edge weights."""
+    keep = (edge_color & color_bit) != 0
+    weights = edge_weights[0 if color_bit == WHITE_EDGE else 1]
+    # eliminate_zeros() compacts in place, so the union's index arrays must not be shared.
+    sub = csr_array((np.where(keep, weights, 0.0), csr.indices.copy(), csr.indptr.copy()), shape=csr.shape)
+    sub.eliminate_zeros()
+    return sub
 
 # === Extended Influence Metrics Wrapper ===
 
-def compute_extended_influence_metrics(influence_graph):
+def compute_extended_metrics_from_csr(csr, zone_index):
     """
-    Compute extended influence metrics for the entire influence graph.
-    Returns a dictionary with:
+    Compute extended influence metrics for an influence graph given as a CSR matrix, with its nodes
+    already assigned to zones (see build_zone_index). Returns a dictionary with:
       - overall_component_metrics: global weighted metrics over all connected components.
       - overall_entropy: entropy of component sizes for the entire graph.
       - overall_centrality_variance: variance of harmonic centrality for the entire graph.
       - zone_metrics: a dict with metrics for queenside, kingside, and center.
       - aggregated_zone_metrics: global aggregated metrics from the zone metrics.
     """
-    components = get_connected_components(influence_graph)
-    total_nodes = sum(comp.number_of_nodes() for comp in components)
-    comp_metrics = [compute_component_metrics(comp) for comp in components]
+    components, comp_metrics, overall_entropy, overall_centrality_variance = compute_graph_component_metrics(csr)
+    total_nodes = sum(block.stop - block.start for block in components)
     overall = {}
     for key in ["diameter", "avg_harmonic_centrality", "avg_clustering", "fiedler"]:
         weighted_sum = sum(m[key] * m["num_nodes"] for m in comp_metrics if m[key] is not None)
         overall[key] = weighted_sum / total_nodes if total_nodes > 0 else None
-    overall_entropy = compute_components_entropy(influence_graph)
-    overall_centrality_variance = compute_harmonic_centrality_variance(influence_graph)
     
-    zones = ["queenside", "kingside", "center"]
     zone_metrics = {}
-    for zone in zones:
-        zone_metrics[zone] = compute_zone_metrics(zone, influence_graph)
+    for zone, zone_nodes in zone_index.items():
+        zone_metrics[zone] = compute_zone_metrics(zone_nodes, csr)
     
     aggregated_zone_metrics = aggregate_zone_metrics(zone_metrics)
     
@@ -205,9 +362,129 @@ def compute_extended_influence_metrics(influence_graph):
         "aggregated_zone_metrics": aggregated_zone_metrics
     }
 
+def compute_extended_influence_metrics(influence_graph):
+    """
+    Compute extended influence metrics for an influence graph given as a NetworkX graph.
+    See compute_extended_metrics_from_csr() for the returned dictionary.
+    """
+    csr, _, _, node_squares = influence_to_csr(influence_graph)
+    return compute_extended_metrics_from_csr(csr, build_zone_index(node_squares))
+
+def compute_all_colors(csr, edge_color, edge_weights, node_squares):
+    """
+    Compute the extended influence metrics of the union, white and black influence graphs of a
+    position from its colored union CSR (see build_colored_influence_csr). The graph conversion and
+    the zone partition are shared by the three colorings; the white and black graphs are derived by
+    masking the union's edges with their color bit.
+    Returns (union_metrics, white_metrics, black_metrics).
+    """
+    zone_index = build_zone_index(node_squares)
+    return tuple(
+        compute_extended_metrics_from_csr(graph, zone_index)
+        for graph in (csr,
+                      color_subgraph(csr, edge_color, edge_weights, WHITE_EDGE),
+                      color_subgraph(csr, edge_color, edge_weights, BLACK_EDGE))
+    )
+
+# === Metric Cache ===
+
+# When enabled (and the game's moves are passed in), one PositionalGraph is updated move by move with
+# PositionalGraph.apply_move() instead of being rebuilt for every position. Positions are then processed
+# sequentially, so the process pool is not used.
+INCREMENTAL_GRAPH_UPDATES = False
+
+# Extended metrics keyed by (color_tag, position_key). Positions recur within a game
+# (repetitions, shuffling in closed positions) and across games (shared openings).
+_METRIC_CACHE = OrderedDict()
+_METRIC_CACHE_SIZE = 4096
+
+def position_key(fen):
+    """
+    Return the part of a FEN that determines the influence graphs: piece placement,
+    castling rights and en passant square. Side to move and move counters are dropped
+    because each color's legal moves are generated with the turn forced to that color.
+    """
+    fields = fen.split(" ")
+    return " ".join(fields[0:1] + fields[2:4])
+
+def get_cached_metrics(color_tag, pos_key):
+    """Return cached extended metrics for (color_tag, pos_key), or None on a miss."""
+    key = (color_tag, pos_key)
+    metrics = _METRIC_CACHE.get(key)
+    if metrics is not None:
+        _METRIC_CACHE.move_to_end(key)
+    return metrics
+
+def store_cached_metrics(color_tag, pos_key, metrics):
+    """Store extended metrics, evicting the least recently used entry when full."""
+    _METRIC_CACHE[(color_tag, pos_key)] = metrics
+    _METRIC_CACHE.move_to_end((color_tag, pos_key))
+    if len(_METRIC_CACHE) > _METRIC_CACHE_SIZE:
+        _METRIC_CACHE.popitem(last=False)
+
+def _compute_graph_metrics(pos_graph):
+    """
+    Compute the extended influence metrics of a PositionalGraph's position for the union, white and
+    black influence graphs, without touching the cache.
+    """
+    return compute_all_colors(*build_colored_influence_csr(pos_graph))
+
+def _compute_fen_metrics(fen):
+    """
+    Compute the extended influence metrics of one position from its FEN, without touching the cache.
+    Runs in worker processes, so it must stay a module-level function.
+    """
+    return _compute_graph_metrics(PositionalGraph(chess.Board(fen)))
+
+def compute_position_metrics(fen, pos_graph=None):
+    """
+    Return the extended influence metrics of a position for the union, white and black
+    influence graphs, using the metric cache. On a miss, pos_graph (a PositionalGraph already
+    at this position) is used if given; otherwise a PositionalGraph is built from the FEN.
+    """
+    pos_key = position_key(fen)
+    cached = [get_cached_metrics(tag, pos_key) for tag in ("union", "white", "black")]
+    if any(metrics is None for metrics in cached):
+        cached = _compute_graph_metrics(pos_graph) if pos_graph is not None else _compute_fen_metrics(fen)
+        for tag, metrics in zip(("union", "white", "black"), cached):
+            store_cached_metrics(tag, pos_key, metrics)
+    return tuple(cached)
+
+def prefetch_position_metrics(game_fens, max_workers=None):
+    """
+    Fill the metric cache for every distinct position in game_fens, computing the missing ones in a
+    process pool (the per-position work is independent). With max_workers=1 nothing is prefetched and
+    positions are computed sequentially on demand.
+    """
+    if max_workers == 1:
+        return
+    missing = {}
+    for fen in game_fens:
+        pos_key = position_key(fen)
+        if pos_key not in missing and any(get_cached_metrics(tag, pos_key) is None for tag in ("union", "white", "black")):
+            missing[pos_key] = fen
+    if len(missing) < 2:
+        return
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(_compute_fen_metrics, missing.values(), chunksize=4)
+        for pos_key, metrics in zip(missing.keys(), results):
+            for tag, tag_metrics in zip(("union", "white", "black"), metrics):
+                store_cached_metrics(tag, pos_key, tag_metrics)
+
+def iter_incremental_graphs(start_fen, moves):
+    """
+    Yield a PositionalGraph for the starting position and after each move. A single graph is
+    updated in place with apply_move(), so each yielded graph is only valid until the next one.
+    """
+    pos_graph = PositionalGraph(chess.Board(start_fen))
+    yield pos_graph
+    for move in moves:
+        pos_graph.apply_move(move)
+        yield pos_graph
+
 # === Comprehensive Graph and Summary Table Generation ===
 
-def generate_comprehensive_outputs(game_fens, output_dir, game_info):
+def generate_comprehensive_outputs(game_fens, output_dir, game_info, max_workers=None, game_moves=None):
     """
     Given a list of FEN strings (one per move), compute extended influence metrics at every move for:
       - The union influence graph (white and black merged)
@@ -227,9 +504,13 @@ def generate_comprehensive_outputs(game_fens, output_dir, game_info):
       2. A single comprehensive interactive summary table that shows, for every move, all metric values for
          every category.
          
-    All output HTML files are saved in output_dir.
+    All output HTML files are saved in output_dir. Position metrics are computed in a process pool of
+    max_workers processes (default: one per CPU); pass max_workers=1 to compute them sequentially.
+    If INCREMENTAL_GRAPH_UPDATES is set and game_moves (the moves leading from game_fens[0] through
+    the following FENs) is given, one PositionalGraph is updated move by move instead.
     
-    Returns a dictionary of computed metrics.
+    Returns a dictionary of computed metrics: per category, a dict mapping each metric key to a list
+    with one float per move (None where a metric is undefined).
     """
     moves = []
     # Define metric keys and labels.
@@ -243,104 +524,50 @@ def generate_comprehensive_outputs(game_fens, output_dir, game_info):
         "harmonic_centrality_variance": "Harmonic Centrality Variance"
     }
     
-    # Initialize containers for overall metrics.
-    overall_union = {k: [] for k in metric_keys}
-    overall_white = {k: [] for k in metric_keys}
-    overall_black = {k: [] for k in metric_keys}
-    # Aggregated zone metrics.
-    agg_union = {k: [] for k in metric_keys}
-    agg_white = {k: [] for k in metric_keys}
-    agg_black = {k: [] for k in metric_keys}
-    # Zone-specific metrics.
+    # Define the 15 categories in plotting and table order: (legend name, scope, color index), where the
+    # scope is "overall", "aggregated" or a zone name and the color index selects union/white/black.
     zones = ["queenside", "kingside", "center"]
-    zone_union = {zone: {k: [] for k in metric_keys} for zone in zones}
-    zone_white = {zone: {k: [] for k in metric_keys} for zone in zones}
-    zone_black = {zone: {k: [] for k in metric_keys} for zone in zones}
+    color_labels = ["Union", "White", "Black"]
+    all_categories = (
+        [(f"Overall – {color}", "overall", c) for c, color in enumerate(color_labels)]
+        + [(f"Aggregated – {color}", "aggregated", c) for c, color in enumerate(color_labels)]
+        + [(f"{zone.capitalize()} – {color}", zone, c) for zone in zones for c, color in enumerate(color_labels)]
+    )  # 3 + 3 + 9 = 15
+    
+    # All metric values in a single array indexed [category, metric, move]; missing values stay NaN.
+    metric_values = np.full((len(all_categories), len(metric_keys), len(game_fens)), np.nan)
+    
+    # Either update one graph move by move, or compute the metrics of all positions up front.
+    if INCREMENTAL_GRAPH_UPDATES and game_moves is not None:
+        pos_graphs = iter_incremental_graphs(game_fens[0], game_moves)
+    else:
+        prefetch_position_metrics(game_fens, max_workers=max_workers)
+        pos_graphs = itertools.repeat(None)
     
     # Process each move.
-    for move_index, fen in enumerate(game_fens, start=1):
-        moves.append(move_index)
-        board = chess.Board(fen)
-        pos_graph = PositionalGraph(board)
-        
-        # Compute union influence metrics.
-        union_inf = union_influence_graph(pos_graph)
-        ext_union = compute_extended_influence_metrics(union_inf)
-        comp_u = ext_union["overall_component_metrics"]
-        overall_union["diameter"].append(comp_u.get("diameter"))
-        overall_union["avg_harmonic_centrality"].append(comp_u.get("avg_harmonic_centrality"))
-        overall_union["avg_clustering"].append(comp_u.get("avg_clustering"))
-        overall_union["fiedler"].append(comp_u.get("fiedler"))
-        overall_union["entropy"].append(ext_union.get("overall_entropy"))
-        overall_union["harmonic_centrality_variance"].append(ext_union.get("overall_centrality_variance"))
-        agg_u = ext_union["aggregated_zone_metrics"]
-        for k in metric_keys:
-            agg_union[k].append(agg_u.get(k))
-        for zone in zones:
-            for k in metric_keys:
-                zone_union[zone][k].append(ext_union["zone_metrics"].get(zone, {}).get(k))
-        
-        # Compute white-only influence metrics.
-        white_inf = pos_graph.compute_influence_subgraph_by_color(chess.WHITE)
-        ext_white = compute_extended_influence_metrics(white_inf)
-        comp_w = ext_white["overall_component_metrics"]
-        overall_white["diameter"].append(comp_w.get("diameter"))
-        overall_white["avg_harmonic_centrality"].append(comp_w.get("avg_harmonic_centrality"))
-        overall_white["avg_clustering"].append(comp_w.get("avg_clustering"))
-        overall_white["fiedler"].append(comp_w.get("fiedler"))
-        overall_white["entropy"].append(ext_white.get("overall_entropy"))
-        overall_white["harmonic_centrality_variance"].append(ext_white.get("overall_centrality_variance"))
-        agg_w = ext_white["aggregated_zone_metrics"]
-        for k in metric_keys:
-            agg_white[k].append(agg_w.get(k))
-        for zone in zones:
-            for k in metric_keys:
-                zone_white[zone][k].append(ext_white["zone_metrics"].get(zone, {}).get(k))
-        
-        # Compute black-only influence metrics.
-        black_inf = pos_graph.compute_influence_subgraph_by_color(chess.BLACK)
-        ext_black = compute_extended_influence_metrics(black_inf)
-        comp_b = ext_black["overall_component_metrics"]
-        overall_black["diameter"].append(comp_b.get("diameter"))
-        overall_black["avg_harmonic_centrality"].append(comp_b.get("avg_harmonic_centrality"))
-        overall_black["avg_clustering"].append(comp_b.get("avg_clustering"))
-        overall_black["fiedler"].append(comp_b.get("fiedler"))
-        overall_black["entropy"].append(ext_black.get("overall_entropy"))
-        overall_black["harmonic_centrality_variance"].append(ext_black.get("overall_centrality_variance"))
-        agg_b = ext_black["aggregated_zone_metrics"]
-        for k in metric_keys:
-            agg_black[k].append(agg_b.get(k))
-        for zone in zones:
-            for k in metric_keys:
-                zone_black[zone][k].append(ext_black["zone_metrics"].get(zone, {}).get(k))
+    for move_idx, (fen, pos_graph) in enumerate(zip(game_fens, pos_graphs)):
+        moves.append(move_idx + 1)
+        ext_by_color = compute_position_metrics(fen, pos_graph)
+        overall_by_color = [
+            dict(ext["overall_component_metrics"], entropy=ext.get("overall_entropy"),
+                 harmonic_centrality_variance=ext.get("overall_centrality_variance"))
+            for ext in ext_by_color
+        ]
+        for cat_idx, (_, scope, c) in enumerate(all_categories):
+            if scope == "overall":
+                values = overall_by_color[c]
+            elif scope == "aggregated":
+                values = ext_by_color[c]["aggregated_zone_metrics"]
+            else:
+                values = ext_by_color[c]["zone_metrics"].get(scope, {})
+            for metric_idx, k in enumerate(metric_keys):
+                value = values.get(k)
+                if value is not None:
+                    metric_values[cat_idx, metric_idx, move_idx] = value
     
     # === Create Comprehensive Graph with 6 Subplots and 15 Unique Legend Groups ===
     fig = make_subplots(rows=2, cols=3, subplot_titles=[metric_labels[k] for k in metric_keys])
     
-    # Define the 15 legend groups.
-    # Overall categories.
-    overall_categories = [
-        ("Overall – Union", overall_union),
-        ("Overall – White", overall_white),
-        ("Overall – Black", overall_black)
-    ]
-    # Aggregated categories.
-    aggregated_categories = [
-        ("Aggregated – Union", agg_union),
-        ("Aggregated – White", agg_white),
-        ("Aggregated – Black", agg_black)
-    ]
-    # Zone-specific categories.
-    zone_categories = []
-    for zone in zones:
-        zone_label = zone.capitalize()
-        zone_categories.append((f"{zone_label} – Union", zone_union[zone]))
-        zone_categories.append((f"{zone_label} – White", zone_white[zone]))
-        zone_categories.append((f"{zone_label} – Black", zone_black[zone]))
-    
-    # Combine all 15 categories.
-    all_categories = overall_categories + aggregated_categories + zone_categories  # 3 + 3 + 9 = 15
-
     # Define distinct and aesthetically pleasing colors for each category using a custom palette.
     # Overall and Aggregated categories will use "solid" and "dash" lines respectively,
     # while Zone-specific categories will use "dot" lines.
@@ -362,28 +589,23 @@ def generate_comprehensive_outputs(game_fens, output_dir, game_info):
         "Center – Black": {"color": "#c5b0d5", "dash": "dot"},
     }
     
-    # We want the legend to show only one item per category. To do that, we add the trace only once per legend group.
-    legend_shown = {}
+    # Plotly takes the ndarray slices directly; NaN values are rendered as gaps just like None.
+    moves_np = np.asarray(moves, dtype=np.int32)
     
+    # We want the legend to show only one item per category, so only the first subplot's traces show it.
     for i, (row, col) in enumerate([(1,1), (1,2), (1,3), (2,1), (2,2), (2,3)]):
         metric_key = metric_keys[i]
-        for (cat_name, cat_data) in all_categories:
-            y_data = cat_data.get(metric_key)
-            # Add the trace with showlegend True only once per legend group.
-            show_legend = False
-            if cat_name not in legend_shown:
-                show_legend = True
-                legend_shown[cat_name] = True
+        for cat_idx, (cat_name, _, _) in enumerate(all_categories):
             # Use the legend_styles dict for color and dash style.
             style = legend_styles.get(cat_name, {"color": "black", "dash": "solid"})
-            fig.add_trace(go.Scatter(
-                x=moves,
-                y=y_data,
+            fig.add_trace(go.Scattergl(
+                x=moves_np,
+                y=metric_values[cat_idx, i],
                 mode="lines+markers",
                 name=cat_name,
                 line=dict(color=style["color"], dash=style["dash"], width=2),
                 legendgroup=cat_name,
-                showlegend=show_legend
+                showlegend=(i == 0)
             ), row=row, col=col)
         fig.update_xaxes(title_text="Move Number", row=row, col=col)
         fig.update_yaxes(title_text=metric_labels[metric_key], row=row, col=col)
@@ -408,30 +630,20 @@ def generate_comprehensive_outputs(game_fens, output_dir, game_info):
     fig.show()
     
     # === Create a Comprehensive Summary Table ===
-    # The table will have one row per move and columns for each metric category.
-    table_columns = ["Move"]
-    table_data = [moves]
-    # For each metric, add columns for Overall and Aggregated for each color, and for each zone.
-    for key, label in zip(metric_keys, [metric_labels[k] for k in metric_keys]):
-        # Overall.
-        table_columns.extend([f"Overall {label} (Union)", f"Overall {label} (White)", f"Overall {label} (Black)"])
-        table_data.extend([overall_union[key], overall_white[key], overall_black[key]])
-        # Aggregated.
-        table_columns.extend([f"Aggregated {label} (Union)", f"Aggregated {label} (White)", f"Aggregated {label} (Black)"])
-        table_data.extend([agg_union[key], agg_white[key], agg_black[key]])
-        # Zone-specific.
-        for zone in zones:
-            zone_label = zone.capitalize()
-            table_columns.extend([
-                f"{zone_label} {label} (Union)",
-                f"{zone_label} {label} (White)",
-                f"{zone_label} {label} (Black)"
-            ])
-            table_data.extend([
-                zone_union[zone][key],
-                zone_white[zone][key],
-                zone_black[zone][key]
-            ])
+    # The table will have one row per move and one column per (metric, category), in category order:
+    # Overall and Aggregated for each color, then each zone for each color.
+    table_columns = ["Move"] + [
+        f"{scope.capitalize()} {metric_labels[k]} ({color_labels[c]})"
+        for k in metric_keys for _, scope, c in all_categories
+    ]
+    def metric_series(cat_idx, metric_idx):
+        # Plain Python floats, with None for missing values, for the table and the returned series.
+        return [None if np.isnan(v) else v for v in metric_values[cat_idx, metric_idx].tolist()]
+    
+    table_data = [moves] + [
+        metric_series(cat_idx, metric_idx)
+        for metric_idx in range(len(metric_keys)) for cat_idx in range(len(all_categories))
+    ]
     
     table_fig = go.Figure(data=[go.Table(
         header=dict(values=table_columns, fill_color='paleturquoise', align='left', font=dict(size=12)),
@@ -442,17 +654,21 @@ def generate_comprehensive_outputs(game_fens, output_dir, game_info):
     table_fig.update_layout(title="<b>Comprehensive Summary Table (All Moves)</b>", height=900, width=1800)
     table_fig.show()
     
+    def category_series(scope, c):
+        cat_idx = next(i for i, (_, cat_scope, cat_c) in enumerate(all_categories) if (cat_scope, cat_c) == (scope, c))
+        return {k: metric_series(cat_idx, metric_idx) for metric_idx, k in enumerate(metric_keys)}
+    
     return {
         "moves": moves,
-        "overall_union": overall_union,
-        "overall_white": overall_white,
-        "overall_black": overall_black,
-        "agg_union": agg_union,
-        "agg_white": agg_white,
-        "agg_black": agg_black,
-        "zone_union": zone_union,
-        "zone_white": zone_white,
-        "zone_black": zone_black
+        "overall_union": category_series("overall", 0),
+        "overall_white": category_series("overall", 1),
+        "overall_black": category_series("overall", 2),
+        "agg_union": category_series("aggregated", 0),
+        "agg_white": category_series("aggregated", 1),
+        "agg_black": category_series("aggregated", 2),
+        "zone_union": {zone: category_series(zone, 0) for zone in zones},
+        "zone_white": {zone: category_series(zone, 1) for zone in zones},
+        "zone_black": {zone: category_series(zone, 2) for zone in zones}
     }
 
 # === MAIN BLOCK ===
@@ -492,11 +708,13 @@ if __name__ == "__main__":
     # Process each game: create subfolder and run analysis.
     for i, game in enumerate(games, start=1):
         game_fens = []
+        game_moves = []
         board = game.board()
         game_fens.append(board.fen())  # starting position
         for move in game.mainline_moves():
             board.push(move)
             game_fens.append(board.fen())
+            game_moves.append(move)
         
         # Create a subfolder for the game.
         game_folder = os.path.join(output_base, f"Game_{i}")
@@ -512,4 +730,4 @@ if __name__ == "__main__":
         }
         
         print(f"Processing Game {i}: {len(game_fens)} positions; results will be saved in: {game_folder}")
-        generate_comprehensive_outputs(game_fens, game_folder, game_info)
+        generate_comprehensive_outputs(game_fens, game_folder, game_info, game_moves=game_moves)
@@ -28,14 +28,44 @@ Features:
 It uses python‑chess for board representation, NetworkX for graph construction, and matplotlib for visualization.
 """
 
+import math
 import chess
+import chess.polyglot
 import networkx as nx
 import numpy as np
 import matplotlib.pyplot as plt
+from scipy.linalg import solve_triangular
+from scipy.sparse.csgraph import connected_components, dijkstra, shortest_path
+from scipy.sparse.linalg import eigsh
+
+# ------------------------------------------------------------------------------
+# Square Lookup Tables
+# ------------------------------------------------------------------------------
+# Square names indexed by python-chess square number, and the reverse mapping.
+_SQ_NAMES = tuple(chess.square_name(sq) for sq in chess.SQUARES)
+_SQ_INDEX = {name: sq for sq, name in enumerate(_SQ_NAMES)}
+# (file, rank) of every square, indexed by square number.
+_SQ_COORD = tuple((sq & 7, sq >> 3) for sq in chess.SQUARES)
+# 1 / (Manhattan distance + 0.1) between every pair of squares, as used by compute_attackers_proximity().
+_INV_MANHATTAN = tuple(
+    tuple(1.0 / (abs((i & 7) - (j & 7)) + abs((i >> 3) - (j >> 3)) + 0.1) for j in chess.SQUARES)
+    for i in chess.SQUARES
+)
+# Orthogonally adjacent square pairs (Manhattan distance 1), each listed once with i < j.
+_ADJ1_PAIRS = tuple((i, j) for i in range(64) for j in range(i + 1, 64)
+                    if abs((i & 7) - (j & 7)) + abs((i >> 3) - (j >> 3)) == 1)
+_ADJ1_I = np.array([i for i, _ in _ADJ1_PAIRS], dtype=np.int8)
+_ADJ1_J = np.array([j for _, j in _ADJ1_PAIRS], dtype=np.int8)
+
+def occupancy_array(bitboard):
+    """Unpack a 64-bit bitboard into a boolean array indexed by square number."""
+    return np.unpackbits(np.frombuffer(bitboard.to_bytes(8, "little"), dtype=np.uint8), bitorder="little").view(bool)
 
 # ------------------------------------------------------------------------------
 # Piece-Specific Distance Measure
 # ------------------------------------------------------------------------------
+_PIECE_TYPE_OF_SYMBOL = {symbol: piece_type for piece_type, symbol in enumerate(chess.PIECE_SYMBOLS) if symbol}
+
 def piece_distance(piece_symbol, from_square, to_square):
     """
     Compute a distance measure between two squares, specific to the piece type.
@@ -55,27 +85,25 @@ def piece_distance(piece_symbol, from_square, to_square):
       - King ('K'): 1 (always moves one square).
       - Pawn ('P'): Manhattan distance.
     """
-    coord1 = square_to_coord(from_square)
-    coord2 = square_to_coord(to_square)
-    dx = abs(coord1[0] - coord2[0])
-    dy = abs(coord1[1] - coord2[1])
-    piece_type = piece_symbol.upper()
-    
-    if piece_type == 'N':
-        return np.sqrt(dx**2 + dy**2)
-    elif piece_type == 'B':
+    # Unknown symbols map to None, which falls through to the Manhattan distance.
+    return piece_distance_sq(_PIECE_TYPE_OF_SYMBOL.get(piece_symbol.lower()),
+                             _SQ_INDEX[from_square], _SQ_INDEX[to_square])
+
+def piece_distance_sq(piece_type, from_sq, to_sq):
+    """
+    piece_distance() for a python-chess piece type and two square numbers. File and rank differences
+    come straight from the square bits, so the hot influence-edge loop needs no name parsing.
+    """
+    dx = abs((from_sq & 7) - (to_sq & 7))
+    dy = abs((from_sq >> 3) - (to_sq >> 3))
+    if piece_type == chess.KNIGHT:
+        return math.sqrt(dx * dx + dy * dy)
+    elif piece_type == chess.BISHOP:
         return max(dx, dy)
-    elif piece_type == 'R':
-        return dx + dy
-    elif piece_type == 'Q':
-        if dx == dy:
-            return max(dx, dy)
-        else:
-            return dx + dy
-    elif piece_type == 'K':
+    elif piece_type == chess.QUEEN and dx == dy:
+        return dx
+    elif piece_type == chess.KING:
         return 1
-    elif piece_type == 'P':
-        return dx + dy
     else:
         return dx + dy
 
@@ -83,9 +111,7 @@ def piece_distance(piece_symbol, from_square, to_square):
 # Helper Functions for Geometry and Control
 # ------------------------------------------------------------------------------
 def square_to_coord(square_name):
-    file = ord(square_name[0]) - ord('a')
-    rank = int(square_name[1]) - 1
-    return (file, rank)
+    return _SQ_COORD[_SQ_INDEX[square_name]]
 
 def manhattan_distance(coord1, coord2):
     return abs(coord1[0] - coord2[0]) + abs(coord1[1] - coord2[1])
@@ -95,8 +121,8 @@ def control_value(square1, square2, board):
     Return 1 if both squares (given by their names) are occupied on the provided board;
     otherwise return 0.
     """
-    if board.piece_at(chess.parse_square(square1)) is not None and \
-       board.piece_at(chess.parse_square(square2)) is not None:
+    if board.piece_at(_SQ_INDEX[square1]) is not None and \
+       board.piece_at(_SQ_INDEX[square2]) is not None:
         return 1
     else:
         return 0
@@ -114,140 +140,301 @@ def control_factor(board, square, color):
     """
     Count the number of attackers on the given square from the specified color.
     """
-    attackers = board.attackers(color, chess.parse_square(square))
-    return len(attackers)
+    return control_factor_sq(board, _SQ_INDEX[square], color)
+
+def control_factor_sq(board, sq, color):
+    """control_factor() for a square given by its number: a popcount of the attackers bitboard."""
+    return chess.popcount(board.attackers_mask(color, sq))
+
+def second_smallest_laplacian_eigenvalue(G):
+    """
+    Return the second smallest eigenvalue of G's weighted Laplacian (None for fewer than two nodes).
+    Zero has one eigenvalue per connected component, so a disconnected graph's value is 0. Otherwise
+    only the two smallest eigenvalues are needed, so they come from ARPACK on the sparse Laplacian
+    (Lanczos can not resolve the repeated zeros of a disconnected graph, hence the component check);
+    graphs too small for ARPACK are decomposed densely.
+    """
+    n = G.number_of_nodes()
+    if n < 2:
+        return None
+    if connected_components(nx.to_scipy_sparse_array(G, weight=None), directed=False)[0] > 1:
+        return 0.0
+    L = nx.laplacian_matrix(G, weight="weight").astype(np.float64)
+    if n <= 3:
+        return float(np.linalg.eigvalsh(L.toarray())[1])
+    vals = eigsh(L, k=2, which="SA", return_eigenvectors=False)
+    return float(np.sort(vals)[1])
+
+def eigenvector_centrality_sparse(G, weight="weight", max_iter=100, tol=1.0e-6):
+    """
+    nx.eigenvector_centrality() computed on a SciPy sparse adjacency matrix: the same power iteration
+    with (A + I), start vector, L2 normalization and L1 convergence test, but each step is one sparse
+    matrix-vector product instead of a Python loop over every edge. Unlike
+    nx.eigenvector_centrality_numpy() it accepts disconnected graphs, which positional graphs usually are.
+    """
+    nodes = list(G)
+    n = len(nodes)
+    if n == 0:
+        raise nx.NetworkXPointlessConcept("cannot compute centrality for the null graph")
+    A_T = nx.to_scipy_sparse_array(G, nodelist=nodes, weight=weight, format="csr").T.tocsr()
+    x = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        xlast = x
+        x = xlast + A_T @ xlast
+        norm = np.linalg.norm(x) or 1
+        x = x / norm
+        if np.abs(x - xlast).sum() < n * tol:
+            return dict(zip(nodes, x.tolist()))
+    raise nx.PowerIterationFailedConvergence(max_iter)
+
+def piece_distances(piece_types, from_sqs, to_sqs):
+    """
+    Vectorized piece_distance_sq(): the distances for parallel arrays of piece types and square numbers,
+    evaluated for all moves at once with one mask per piece rule. Returns a float64 array.
+    """
+    dx = np.abs((from_sqs & 7) - (to_sqs & 7)).astype(np.float64)
+    dy = np.abs((from_sqs >> 3) - (to_sqs >> 3)).astype(np.float64)
+    distances = dx + dy
+    distances = np.where(piece_types == chess.KNIGHT, np.sqrt(dx * dx + dy * dy), distances)
+    chebyshev = (piece_types == chess.BISHOP) | ((piece_types == chess.QUEEN) & (dx == dy))
+    distances = np.where(chebyshev, np.maximum(dx, dy), distances)
+    return np.where(piece_types == chess.KING, 1.0, distances)
+
+def weighted_distance_matrix(G, weight="weight"):
+    """
+    Return (nodes, dist): the all-pairs weighted shortest-path lengths of an undirected graph from a
+    single SciPy Dijkstra run, in the order of nodes (inf for unreachable pairs). Closeness and
+    betweenness centrality both read this one matrix.
+    """
+    nodes = list(G)
+    W = nx.to_scipy_sparse_array(G, nodelist=nodes, weight=weight, format="csr")
+    return nodes, dijkstra(W, directed=False)
+
+def closeness_centrality_sparse(G, weight="weight", dist=None):
+    """
+    nx.closeness_centrality(G, distance=weight) (with the Wasserman-Faust correction for disconnected
+    graphs) as one NumPy reduction over the weighted distance matrix. dist may be passed in from
+    weighted_distance_matrix(G) to share it with other metrics.
+    """
+    nodes = list(G)
+    n = len(nodes)
+    if dist is None:
+        _, dist = weighted_distance_matrix(G, weight)
+    finite = np.isfinite(dist)
+    reachable = finite.sum(axis=1) - 1
+    total = np.where(finite, dist, 0.0).sum(axis=1)
+    closeness = np.zeros(n)
+    if n > 1:
+        np.divide(reachable, total, out=closeness, where=total > 0)
+        closeness *= reachable / (n - 1)
+    return dict(zip(nodes, closeness.tolist()))
+
+def global_efficiency_sparse(G):
+    """nx.global_efficiency(G): the mean inverse hop distance over ordered node pairs, from one BFS run."""
+    n = len(G)
+    if n < 2:
+        return 0
+    hops = shortest_path(nx.to_scipy_sparse_array(G, weight=None, format="csr"), directed=False, unweighted=True)
+    connected = np.isfinite(hops) & (hops > 0)
+    return float((1.0 / hops[connected]).sum() / (n * (n - 1)))
+
+def betweenness_centrality_sparse(G, weight="weight", dist=None):
+    """
+    Normalized weighted betweenness centrality, as nx.betweenness_centrality(G, weight=weight), with the
+    shortest-path search done by SciPy's Dijkstra for all sources at once. For each source, the edges on
+    a shortest path (dist[v] + w(v, u) == dist[u], up to floating-point rounding) form a DAG T in distance
+    order, and Brandes' recurrences become two triangular solves:
+      - path counts:  (I - T^T) sigma = e_source
+      - dependencies: (I - T) c = 1 / sigma, with delta = sigma * c - 1
+    dist may be passed in from weighted_distance_matrix(G) to share it with other metrics.
+    """
+    nodes = list(G)
+    n = len(nodes)
+    betweenness = np.zeros(n)
+    if n > 0 and G.number_of_edges() > 0:
+        W = nx.to_scipy_sparse_array(G, nodelist=nodes, weight=weight, format="csr")
+        if dist is None:
+            dist = dijkstra(W, directed=False)
+        W = W.toarray()
+        edge = W > 0
+        for s in range(n):
+            reached = np.flatnonzero(np.isfinite(dist[s]))
+            if reached.size <= 2:
+                continue
+            order = reached[np.argsort(dist[s, reached], kind="stable")]
+            d = dist[s, order]
+            tight = edge[np.ix_(order, order)] & np.isclose(d[:, None] + W[np.ix_(order, order)], d[None, :],
+                                                            rtol=1e-12, atol=0.0)
+            system = np.eye(order.size) - tight
+            source = np.zeros(order.size)
+            source[0] = 1.0
+            sigma = solve_triangular(system.T, source, lower=True, unit_diagonal=True)
+            delta = sigma * solve_triangular(system, 1.0 / sigma, lower=False, unit_diagonal=True) - 1.0
+            betweenness[order[1:]] += delta[1:]
+        if n > 2:
+            betweenness /= (n - 1) * (n - 2)
+    return dict(zip(nodes, betweenness.tolist()))
+
+def _influence_edges(board):
+    """
+    Return the influence edges of the side to move as (from_square, to_square, attributes) tuples,
+    one per legal move, weighted 1 + piece_distance. The weights of all moves are computed in one
+    vectorized piece_distances() call.
+    """
+    moves = list(board.legal_moves)
+    if not moves:
+        return []
+    from_sqs = np.array([move.from_square for move in moves], dtype=np.int8)
+    to_sqs = np.array([move.to_square for move in moves], dtype=np.int8)
+    piece_types = np.array([board.piece_type_at(sq) for sq in from_sqs.tolist()], dtype=np.int8)
+    weights = (1 + piece_distances(piece_types, from_sqs, to_sqs)).tolist()
+    return [(_SQ_NAMES[move.from_square], _SQ_NAMES[move.to_square], {"type": "influence", "weight": weight})
+            for move, weight in zip(moves, weights)]
 
 # ------------------------------------------------------------------------------
 # Pawn Role Determination Using Chess Theory
 # ------------------------------------------------------------------------------
+# Bitboard masks, indexed by square number, for the pawn role tests below:
+#   _ADJ_FILES:      the files next to the square's file.
+#   _FRONT_SPAN:     per color, the square's file and adjacent files on ranks strictly ahead of it.
+#   _SUPPORT_SPAN:   per color, the adjacent files on the square's rank and the ranks ahead of it.
+#   _CHAIN_SUPPORT:  per color, the two squares diagonally behind the square.
+def _ranks_mask(ranks):
+    mask = 0
+    for r in ranks:
+        mask |= chess.BB_RANKS[r]
+    return mask
+
+_ADJ_FILES = tuple(
+    (chess.BB_FILES[(sq & 7) - 1] if sq & 7 > 0 else 0) | (chess.BB_FILES[(sq & 7) + 1] if sq & 7 < 7 else 0)
+    for sq in chess.SQUARES
+)
+_FRONT_SPAN = {
+    chess.WHITE: tuple((chess.BB_FILES[sq & 7] | _ADJ_FILES[sq]) & _ranks_mask(range((sq >> 3) + 1, 8)) for sq in chess.SQUARES),
+    chess.BLACK: tuple((chess.BB_FILES[sq & 7] | _ADJ_FILES[sq]) & _ranks_mask(range(0, sq >> 3)) for sq in chess.SQUARES),
+}
+_SUPPORT_SPAN = {
+    chess.WHITE: tuple(_ADJ_FILES[sq] & _ranks_mask(range(sq >> 3, 8)) for sq in chess.SQUARES),
+    chess.BLACK: tuple(_ADJ_FILES[sq] & _ranks_mask(range(0, (sq >> 3) + 1)) for sq in chess.SQUARES),
+}
+_CHAIN_SUPPORT = {
+    chess.WHITE: chess.BB_PAWN_ATTACKS[chess.BLACK],
+    chess.BLACK: chess.BB_PAWN_ATTACKS[chess.WHITE],
+}
+
 def get_pawn_roles(board, square):
+    """
+    Return the roles of the pawn on the given square (an empty list if there is no pawn):
+      - isolated:     no friendly pawn on an adjacent file.
+      - passed:       no enemy pawn ahead of it on its own or an adjacent file.
+      - chain_member: defended by a friendly pawn diagonally behind it.
+      - backward:     no friendly pawn on an adjacent file level with or ahead of it.
+    Each test is a single bitboard intersection with a precomputed mask.
+    """
     roles = []
-    sq_index = chess.parse_square(square)
+    sq_index = _SQ_INDEX[square]
     piece = board.piece_at(sq_index)
-    if piece is None or piece.symbol().lower() != 'p':
+    if piece is None or piece.piece_type != chess.PAWN:
         return roles
     color = piece.color
-    file_index = chess.square_file(sq_index)
-    rank_index = chess.square_rank(sq_index)
+    own_pawns = board.pawns & board.occupied_co[color]
+    enemy_pawns = board.pawns & board.occupied_co[not color]
     
-    adjacent_files = []
-    if file_index > 0:
-        adjacent_files.append(file_index - 1)
-    if file_index < 7:
-        adjacent_files.append(file_index + 1)
-    
-    # Isolated Pawn:
-    isolated = True
-    for other_sq in chess.SQUARES:
-        if other_sq == sq_index:
-            continue
-        other_piece = board.piece_at(other_sq)
-        if other_piece is not None and other_piece.symbol().lower() == 'p' and other_piece.color == color:
-            other_file = chess.square_file(other_sq)
-            if other_file in adjacent_files:
-                isolated = False
-                break
-    if isolated:
+    if not own_pawns & _ADJ_FILES[sq_index]:
         roles.append("isolated")
-    
-    # Passed Pawn:
-    passed = True
-    if color == chess.WHITE:
-        for other_sq in chess.SQUARES:
-            other_piece = board.piece_at(other_sq)
-            if other_piece is not None and other_piece.symbol().lower() == 'p' and other_piece.color != color:
-                other_file = chess.square_file(other_sq)
-                other_rank = chess.square_rank(other_sq)
-                if other_file in ([file_index] + adjacent_files) and other_rank > rank_index:
-                    passed = False
-                    break
-    else:
-        for other_sq in chess.SQUARES:
-            other_piece = board.piece_at(other_sq)
-            if other_piece is not None and other_piece.symbol().lower() == 'p' and other_piece.color != color:
-                other_file = chess.square_file(other_sq)
-                other_rank = chess.square_rank(other_sq)
-                if other_file in ([file_index] + adjacent_files) and other_rank < rank_index:
-                    passed = False
-                    break
-    if passed:
+    if not enemy_pawns & _FRONT_SPAN[color][sq_index]:
         roles.append("passed")
-    
-    # Chain Member:
-    chain_member = False
-    if color == chess.WHITE:
-        if rank_index > 0:
-            if file_index > 0:
-                sq_support = chess.square(file_index - 1, rank_index - 1)
-                other_piece = board.piece_at(sq_support)
-                if other_piece is not None and other_piece.symbol().lower() == 'p' and other_piece.color == color:
-                    chain_member = True
-            if file_index < 7:
-                sq_support = chess.square(file_index + 1, rank_index - 1)
-                other_piece = board.piece_at(sq_support)
-                if other_piece is not None and other_piece.symbol().lower() == 'p' and other_piece.color == color:
-                    chain_member = True
-    else:
-        if rank_index < 7:
-            if file_index > 0:
-                sq_support = chess.square(file_index - 1, rank_index + 1)
-                other_piece = board.piece_at(sq_support)
-                if other_piece is not None and other_piece.symbol().lower() == 'p' and other_piece.color == color:
-                    chain_member = True
-            if file_index < 7:
-                sq_support = chess.square(file_index + 1, rank_index + 1)
-                other_piece = board.piece_at(sq_support)
-                if other_piece is not None and other_piece.symbol().lower() == 'p' and other_piece.color == color:
-                    chain_member = True
-    if chain_member:
+    if own_pawns & _CHAIN_SUPPORT[color][sq_index]:
         roles.append("chain_member")
-    
-    # Backward Pawn:
-    backward = False
-    if color == chess.WHITE:
-        support_found = False
-        for other_sq in chess.SQUARES:
-            if other_sq == sq_index:
-                continue
-            other_piece = board.piece_at(other_sq)
-            if other_piece is not None and other_piece.symbol().lower() == 'p' and other_piece.color == color:
-                other_file = chess.square_file(other_sq)
-                other_rank = chess.square_rank(other_sq)
-                if other_file in adjacent_files and other_rank >= rank_index:
-                    support_found = True
-                    break
-        if not support_found:
-            backward = True
-    else:
-        support_found = False
-        for other_sq in chess.SQUARES:
-            if other_sq == sq_index:
-                continue
-            other_piece = board.piece_at(other_sq)
-            if other_piece is not None and other_piece.symbol().lower() == 'p' and other_piece.color == color:
-                other_file = chess.square_file(other_sq)
-                other_rank = chess.square_rank(other_sq)
-                if other_file in adjacent_files and other_rank <= rank_index:
-                    support_found = True
-                    break
-        if not support_found:
-            backward = True
-    if backward:
+    if not own_pawns & _SUPPORT_SPAN[color][sq_index]:
         roles.append("backward")
     
     return roles
 
+def _shift_east(bb):
+    return (bb << 1) & ~chess.BB_FILE_A & chess.BB_ALL
+
+def _shift_west(bb):
+    return (bb >> 1) & ~chess.BB_FILE_H
+
+def _shift_forward(bb, color, shift=8):
+    """Move every square of bb shift // 8 ranks ahead (from color's side), dropping squares off the board."""
+    return (bb << shift) & chess.BB_ALL if color == chess.WHITE else bb >> shift
+
+def _fill_forward(bb, color):
+    """Return bb together with every square ahead of its squares on the same file (from color's side)."""
+    for shift in (8, 16, 32):
+        bb |= _shift_forward(bb, color, shift)
+    return bb
+
+def _fill_backward(bb, color):
+    """Return bb together with every square behind its squares on the same file (from color's side)."""
+    return _fill_forward(bb, not color)
+
+def _compute_all_pawn_roles(board):
+    """
+    Compute the roles of every pawn on the board at once, with the same definitions as get_pawn_roles().
+    For each color the four roles are evaluated for all of its pawns together as bitboards, e.g. the
+    isolated pawns are the pawns outside the adjacent files of their own pawn files.
+    Returns {square number: roles} in ascending square order.
+    """
+    role_masks = {}
+    for color in chess.COLORS:
+        own = board.pawns & board.occupied_co[color]
+        enemy = board.pawns & board.occupied_co[not color]
+        own_files = _fill_backward(_fill_forward(own, color), color)
+        # Squares strictly behind an enemy pawn on its own or an adjacent file can not hold a passed pawn.
+        enemy_behind = _fill_backward(_shift_forward(enemy, not color), color)
+        enemy_span = enemy_behind | _shift_east(enemy_behind) | _shift_west(enemy_behind)
+        # Squares level with or behind a friendly pawn on an adjacent file are supported.
+        own_behind = _fill_backward(own, color)
+        own_span = _shift_east(own_behind) | _shift_west(own_behind)
+        own_attacks = 0
+        for sq in chess.scan_forward(own):
+            own_attacks |= chess.BB_PAWN_ATTACKS[color][sq]
+        role_masks[color] = (
+            ("isolated", own & ~(_shift_east(own_files) | _shift_west(own_files))),
+            ("passed", own & ~enemy_span),
+            ("chain_member", own & own_attacks),
+            ("backward", own & ~own_span),
+        )
+    roles = {}
+    for sq in chess.scan_forward(board.pawns):
+        bit = chess.BB_SQUARES[sq]
+        masks = role_masks[bool(board.occupied_co[chess.WHITE] & bit)]
+        roles[sq] = [role for role, mask in masks if mask & bit]
+    return roles
+
 # ------------------------------------------------------------------------------
 # Zone Assignment Using Chess Theory
 # ------------------------------------------------------------------------------
-def get_zone(square):
-    file_index, rank_index = square_to_coord(square)
+_ZONE_NAMES = ("center", "kingside", "queenside")
+
+def _zone_index(sq):
+    file_index, rank_index = sq & 7, sq >> 3
     if file_index in [3, 4] and rank_index in [3, 4]:
-        return "center"
+        return 0
     elif file_index >= 4:
-        return "kingside"
+        return 1
     else:
-        return "queenside"
+        return 2
+
+# Index into _ZONE_NAMES of every square's zone, indexed by square number.
+_ZONE_OF = tuple(_zone_index(sq) for sq in chess.SQUARES)
+
+def get_zone(square):
+    return _ZONE_NAMES[_ZONE_OF[_SQ_INDEX[square]]]
+
+def _build_default_zones():
+    zones = {"center": set(), "kingside": set(), "queenside": set()}
+    for sq, square in enumerate(_SQ_NAMES):
+        zones[_ZONE_NAMES[_ZONE_OF[sq]]].add(square)
+    return {zone: frozenset(squares) for zone, squares in zones.items()}
+
+# The get_zone() partition of the board, shared by every PositionalGraph built without explicit zones.
+# Its square sets are frozensets, so the shared mapping can not be modified through one instance.
+_DEFAULT_ZONES = _build_default_zones()
+_DEFAULT_CENTER_SQUARES = [(square, _SQ_INDEX[square]) for square in _DEFAULT_ZONES["center"]]
 
 # ------------------------------------------------------------------------------
 # Main Class: PositionalGraph
@@ -257,20 +444,19 @@ class PositionalGraph:
         """
         Initialize the positional graph using a python‑chess Board instance.
         Optionally, a dictionary mapping zone names to sets of square names may be provided.
-        If not, zones are assigned using get_zone().
+        If not, zones are assigned using get_zone(); that default mapping is shared between
+        instances and must be treated as read-only.
         """
         self.board = board
         self.graph = nx.Graph()
-        self.board_squares = [chess.square_name(sq) for sq in chess.SQUARES]
+        self._inf_cache = {}
+        self.board_squares = _SQ_NAMES
         if zones is None:
-            self.zones = {"center": set(), "kingside": set(), "queenside": set()}
-            for square in self.board_squares:
-                zone_label = get_zone(square)
-                if zone_label not in self.zones:
-                    self.zones[zone_label] = set()
-                self.zones[zone_label].add(square)
+            self.zones = _DEFAULT_ZONES
+            self._center_squares = _DEFAULT_CENTER_SQUARES
         else:
             self.zones = zones
+            self._center_squares = [(square, _SQ_INDEX[square]) for square in self.zones.get("center", set())]
         self._build_graph()
 
     def _build_graph(self):
@@ -288,32 +474,26 @@ class PositionalGraph:
             self.graph.add_node(square, type="square")
 
     def _add_pawn_nodes(self):
-        for square in self.board_squares:
-            sq = chess.parse_square(square)
-            piece = self.board.piece_at(sq)
-            if piece is not None and piece.symbol().lower() == 'p':
-                roles = get_pawn_roles(self.board, square)
-                pawn_node = f"pawn_{square}"
-                self.graph.add_node(pawn_node, type="pawn", roles=roles, square=square)
+        for sq, roles in _compute_all_pawn_roles(self.board).items():
+            square = _SQ_NAMES[sq]
+            pawn_node = f"pawn_{square}"
+            self.graph.add_node(pawn_node, type="pawn", roles=roles, square=square)
 
     def _add_zone_nodes(self):
         for zone_name in self.zones.keys():
             self.graph.add_node(zone_name, type="zone")
 
     def _add_adjacency_edges(self):
-        for i, s1 in enumerate(self.board_squares):
-            for s2 in self.board_squares[i+1:]:
-                coord1 = square_to_coord(s1)
-                coord2 = square_to_coord(s2)
-                if manhattan_distance(coord1, coord2) == 1:
-                    cv = control_value(s1, s2, self.board)
-                    if cv == 1:
-                        weight = cv * (1 + manhattan_distance(coord1, coord2))
-                        self.graph.add_edge(s1, s2, type="adjacency", weight=weight)
+        # Both squares of a pair must be occupied; all 112 pairs are tested at once on the occupancy array.
+        # Adjacent squares are at distance 1, so every adjacency edge has weight 1 + 1.
+        occupied = occupancy_array(self.board.occupied)
+        both = np.flatnonzero(occupied[_ADJ1_I] & occupied[_ADJ1_J])
+        self.graph.add_edges_from(
+            (_SQ_NAMES[_ADJ1_I[k]], _SQ_NAMES[_ADJ1_J[k]], {"type": "adjacency", "weight": 2}) for k in both.tolist()
+        )
 
     def _add_pawn_support_edges(self):
-        for square in self.board_squares:
-            sq = chess.parse_square(square)
+        for sq, square in enumerate(_SQ_NAMES):
             piece = self.board.piece_at(sq)
             if piece is not None and piece.symbol().lower() == 'p':
                 file, rank = square_to_coord(square)
@@ -323,74 +503,137 @@ class PositionalGraph:
                     support_coords = [(file - 1, rank - 1), (file + 1, rank - 1)]
                 for f, r in support_coords:
                     if 0 <= f < 8 and 0 <= r < 8:
-                        support_square = chr(ord('a') + f) + str(r + 1)
-                        pawn_node = f"pawn_{square}"
-                        distance = piece_distance('P', square, support_square)
-                        w = control_value(square, support_square, self.board)
-                        if w == 1:
-                            weight = w * (1 + distance)
-                            self.graph.add_edge(pawn_node, support_square, type="pawn_support", weight=weight)
+                        support_sq = f | (r << 3)
+                        # The pawn's own square is occupied, so only the support square needs checking.
+                        if self.board.piece_at(support_sq) is not None:
+                            distance = piece_distance_sq(chess.PAWN, sq, support_sq)
+                            self.graph.add_edge(f"pawn_{square}", _SQ_NAMES[support_sq], type="pawn_support",
+                                                weight=1 + distance)
 
     def _add_influence_edges(self):
         """
         For each piece on the board, add influence edges from the piece's square to each square it legally moves to.
         Weight is computed using piece_distance (weight = 1 + piece_distance).
-        Uses board.generate_legal_moves() for the current board state.
+        Uses board.legal_moves for the current board state.
         """
-        legal_moves = list(self.board.generate_legal_moves())
-        moves_from = {}
-        for move in legal_moves:
-            moves_from.setdefault(move.from_square, []).append(move)
-        for square in self.board_squares:
-            sq = chess.parse_square(square)
-            piece = self.board.piece_at(sq)
-            if piece is not None:
-                moves = moves_from.get(sq, [])
-                for move in moves:
-                    target = chess.square_name(move.to_square)
-                    distance = piece_distance(piece.symbol(), square, target)
-                    weight = 1 + distance
-                    self.graph.add_edge(square, target, type="influence", weight=weight)
+        self.graph.add_edges_from(_influence_edges(self.board))
 
     def _add_zone_edges(self):
         """
         Add an edge between each square and its corresponding zone node,
         but only if the square is occupied by a piece.
         """
-        for square in self.board_squares:
+        for sq, square in enumerate(_SQ_NAMES):
             # Only add the zone edge if the square is occupied.
-            if self.board.piece_at(chess.parse_square(square)) is not None:
-                zone_label = get_zone(square)
+            if self.board.piece_at(sq) is not None:
+                zone_label = _ZONE_NAMES[_ZONE_OF[sq]]
                 # Add an edge with a constant weight (e.g., 1) from the square to its zone.
                 self.graph.add_edge(square, zone_label, type="zone", weight=1)
 
+    # ------------------------------------------------------------------------------
+    # Incremental Update
+    # ------------------------------------------------------------------------------
+    def apply_move(self, move):
+        """
+        Play a move on self.board and update the graph in place instead of rebuilding it.
+        Only the squares whose occupant changed (from/to squares, castling rook, en passant
+        capture) are revisited for adjacency and zone edges, and the pawn layer is rebuilt
+        only when a pawn or a pawn-support square is involved. Influence edges are always
+        regenerated, since pins and checks make legal moves depend on the whole board.
+        The result is the same graph as PositionalGraph(board) on the new position.
+        """
+        before = self.board.piece_map()
+        self.board.push(move)
+        after = self.board.piece_map()
+        changed = {sq for sq in set(before) | set(after) if before.get(sq) != after.get(sq)}
+
+        # Influence edges share square pairs with adjacency edges (and overwrite them when
+        # the graph is built), so drop them first and restore any adjacency they replaced.
+        influence_pairs = [(u, v) for u, v, d in self.graph.edges(data=True) if d.get("type") == "influence"]
+        self.graph.remove_edges_from(influence_pairs)
+        pairs = set()
+        for sq in changed:
+            file, rank = chess.square_file(sq), chess.square_rank(sq)
+            for f, r in [(file - 1, rank), (file + 1, rank), (file, rank - 1), (file, rank + 1)]:
+                if 0 <= f < 8 and 0 <= r < 8:
+                    pairs.add((_SQ_NAMES[sq], _SQ_NAMES[chess.square(f, r)]))
+        for u, v in influence_pairs:
+            if manhattan_distance(square_to_coord(u), square_to_coord(v)) == 1:
+                pairs.add((u, v))
+        for s1, s2 in pairs:
+            if control_value(s1, s2, self.board) == 1:
+                self.graph.add_edge(s1, s2, type="adjacency", weight=2)
+            elif self.graph.has_edge(s1, s2) and self.graph[s1][s2].get("type") == "adjacency":
+                self.graph.remove_edge(s1, s2)
+
+        if self._pawn_layer_affected(changed, before, after):
+            pawn_nodes = [n for n, attr in self.graph.nodes(data=True) if attr.get("type") == "pawn"]
+            self.graph.remove_nodes_from(pawn_nodes)
+            self._add_pawn_nodes()
+            self._add_pawn_support_edges()
+
+        self._add_influence_edges()
+
+        for sq in changed:
+            square, zone_label = _SQ_NAMES[sq], _ZONE_NAMES[_ZONE_OF[sq]]
+            if sq in after:
+                self.graph.add_edge(square, zone_label, type="zone", weight=1)
+            elif self.graph.has_edge(square, zone_label):
+                self.graph.remove_edge(square, zone_label)
+
+    def _pawn_layer_affected(self, changed, before, after):
+        """
+        Return True if a change on the given squares can alter pawn nodes, pawn roles or
+        pawn support edges: a pawn moved, appeared or disappeared, or a square diagonally
+        in front of a pawn changed occupancy.
+        """
+        for pieces in (before, after):
+            for sq, piece in pieces.items():
+                if piece.piece_type != chess.PAWN:
+                    continue
+                if sq in changed:
+                    return True
+                rank = chess.square_rank(sq) + (1 if piece.color == chess.WHITE else -1)
+                for f in (chess.square_file(sq) - 1, chess.square_file(sq) + 1):
+                    if 0 <= f < 8 and 0 <= rank < 8 and chess.square(f, rank) in changed:
+                        return True
+        return False
+
     # ------------------------------------------------------------------------------
     # Influence Subgraph Computation by Color
     # ------------------------------------------------------------------------------
-    def compute_influence_subgraph_by_color(self, color):
+    def compute_influence_subgraph_by_color(self, color, directed=False):
         """
         Compute the influence subgraph for a given color.
-        Create a fresh board copy, set its turn, generate legal moves,
+        Set the board's turn to that color, generate legal moves (restoring the turn afterwards),
         and build a subgraph with only influence edges based on those moves.
+        By default the subgraph is an undirected nx.Graph, which every metric in this project
+        (and community detection) expects. With directed=True it is an nx.DiGraph whose edges
+        keep the direction of the move (piece square -> target square), for directed variants
+        of the distance-based metrics.
+        The subgraph keeps every node of the positional graph with its attributes, not just the
+        edge endpoints: averages over nodes (degree, closeness, betweenness, clustering), component
+        entropies, and the zone assignment of pawn nodes in the extended influence metrics all
+        depend on the full node set.
+        The result is memoized per color and directedness for the current position (keyed by its Zobrist hash), so
+        callers must treat the returned graph as read-only.
         """
-        board_copy = self.board.copy(stack=False)
-        board_copy.turn = color
-        legal_moves = list(board_copy.generate_legal_moves())
-        moves_from = {}
-        for move in legal_moves:
-            moves_from.setdefault(move.from_square, []).append(move)
-        G_inf = nx.Graph()
+        key = (color, chess.polyglot.zobrist_hash(self.board), directed)
+        G_inf = self._inf_cache.get(key)
+        if G_inf is not None:
+            return G_inf
+        G_inf = nx.DiGraph() if directed else nx.Graph()
         G_inf.add_nodes_from(self.graph.nodes(data=True))
-        for square in self.board_squares:
-            sq = chess.parse_square(square)
-            piece = board_copy.piece_at(sq)
-            if piece is not None:
-                moves = moves_from.get(sq, [])
-                for move in moves:
-                    target = chess.square_name(move.to_square)
-                    distance = piece_distance(piece.symbol(), square, target)
-                    weight = 1 + distance
-                    G_inf.add_edge(square, target, type="influence", weight=weight)
+        # Generate the moves on self.board with its turn flipped temporarily instead of on a copy.
+        saved_turn = self.board.turn
+        self.board.turn = color
+        try:
+            G_inf.add_edges_from(_influence_edges(self.board))
+        finally:
+            self.board.turn = saved_turn
+        # Entries of earlier positions (after apply_move) can never be hit again.
+        self._inf_cache = {k: v for k, v in self._inf_cache.items() if k[1] == key[1]}
+        self._inf_cache[key] = G_inf
         return G_inf
 
     # ------------------------------------------------------------------------------
@@ -409,7 +652,7 @@ class PositionalGraph:
                 square = attr.get("square")
                 file, rank = square_to_coord(square)
                 if rank >= 4:
-                    pawn = self.board.piece_at(chess.parse_square(square))
+                    pawn = self.board.piece_at(_SQ_INDEX[square])
                     if pawn and pawn.color == chess.WHITE:
                         distance_to_promotion = 7 - rank
                     else:
@@ -418,16 +661,15 @@ class PositionalGraph:
         return score
 
     def compute_space_score(self, color=chess.WHITE):
-        central_squares = self.zones.get("center", set())
         score = 0.0
-        for square in central_squares:
+        for square, sq in self._center_squares:
             w = square_weight(square)
-            ctrl = control_factor(self.board, square, color)
+            ctrl = control_factor_sq(self.board, sq, color)
             score += w * ctrl
         return score
 
     def compute_shield_index(self, king_square, color=chess.WHITE):
-        king_square_name = chess.square_name(king_square)
+        king_square_name = _SQ_NAMES[king_square]
         king_file, king_rank = square_to_coord(king_square_name)
         shield_count = 0
         rank_offset = 1 if color == chess.WHITE else -1
@@ -435,22 +677,17 @@ class PositionalGraph:
             f = king_file + df
             r = king_rank + rank_offset
             if 0 <= f < 8 and 0 <= r < 8:
-                square_str = chr(ord('a') + f) + str(r + 1)
+                square_str = _SQ_NAMES[f | (r << 3)]
                 pawn_node = f"pawn_{square_str}"
                 if self.graph.has_node(pawn_node):
                     shield_count += 1
         return shield_count
 
     def compute_attackers_proximity(self, king_square, color=chess.WHITE):
-        king_coord = square_to_coord(chess.square_name(king_square))
         proximity = 0.0
-        enemy_color = not color
-        for square in self.board_squares:
-            sq = chess.parse_square(square)
-            piece = self.board.piece_at(sq)
-            if piece is not None and piece.color == enemy_color:
-                dist = manhattan_distance(king_coord, square_to_coord(square))
-                proximity += 1.0 / (dist + 0.1)
+        inverse_distances = _INV_MANHATTAN[king_square]
+        for sq in chess.scan_forward(self.board.occupied_co[not color]):
+            proximity += inverse_distances[sq]
         return proximity
 
     # --- Spectral Invariants ---
@@ -462,7 +699,7 @@ class PositionalGraph:
         spectral["laplacian_spectrum"] = eigenvalues_sorted
         spectral["fiedler_value"] = eigenvalues_sorted[1] if len(eigenvalues_sorted) > 1 else None
 
-        ev_centrality = nx.eigenvector_centrality(self.graph, weight="weight", max_iter=1000)
+        ev_centrality = eigenvector_centrality_sparse(self.graph, weight="weight", max_iter=1000)
         spectral["eigenvector_centrality"] = ev_centrality
         spectral["average_eigenvector_centrality"] = np.mean(list(ev_centrality.values()))
 
@@ -471,15 +708,15 @@ class PositionalGraph:
         if color is not None:
             G_inf = self.compute_influence_subgraph_by_color(color)
             if G_inf.number_of_edges() > 0:
-                L_inf = nx.laplacian_matrix(G_inf, weight="weight").todense()
-                eigenvalues_inf = np.linalg.eigvalsh(L_inf)
-                eigenvalues_inf_sorted = sorted(eigenvalues_inf.tolist())
-                spectral["influence_fiedler_value"] = eigenvalues_inf_sorted[1] if len(eigenvalues_inf_sorted) > 1 else None
+                spectral["influence_fiedler_value"] = second_smallest_laplacian_eigenvalue(G_inf)
             else:
                 spectral["influence_fiedler_value"] = None
 
+            # One Dijkstra run serves both closeness and betweenness.
+            _, inf_dist = weighted_distance_matrix(G_inf, weight="weight")
+
             try:
-                spectral["influence_global_efficiency"] = nx.global_efficiency(G_inf)
+                spectral["influence_global_efficiency"] = global_efficiency_sparse(G_inf)
             except Exception:
                 spectral["influence_global_efficiency"] = None
 
@@ -490,13 +727,13 @@ class PositionalGraph:
                 spectral["influence_avg_degree"] = None
 
             try:
-                closeness = nx.closeness_centrality(G_inf, distance='weight')
+                closeness = closeness_centrality_sparse(G_inf, weight='weight', dist=inf_dist)
                 spectral["influence_avg_closeness"] = np.mean(list(closeness.values()))
             except Exception:
                 spectral["influence_avg_closeness"] = None
 
             try:
-                betweenness = nx.betweenness_centrality(G_inf, weight='weight')
+                betweenness = betweenness_centrality_sparse(G_inf, weight='weight', dist=inf_dist)
                 spectral["influence_avg_betweenness"] = np.mean(list(betweenness.values()))
             except Exception:
                 spectral["influence_avg_betweenness"] = None
@@ -12,29 +12,49 @@ PIECE_VALUES = {
     chess.QUEEN: 9,
     chess.KING: 0  # We'll ignore the king's 'value' in terms of material
 }
+# The same values as a tuple aligned with chess.PIECE_TYPES
+PIECE_VALUE_ARR = tuple(PIECE_VALUES[piece_type] for piece_type in chess.PIECE_TYPES)
 
-def squares_attacked(board: chess.Board, color: bool) -> int:
+def pawn_attacks_mask(pawns: int, color: bool) -> int:
+    """
+    Returns the squares attacked by a whole set of pawns at once, by shifting
+    the pawn bitboard diagonally forward (file A/H pawns only attack inward).
+    """
+    left = pawns & ~chess.BB_FILE_A
+    right = pawns & ~chess.BB_FILE_H
+    if color == chess.WHITE:
+        return ((left << 7) | (right << 9)) & chess.BB_ALL
+    return (left >> 9) | (right >> 7)
+
+def attacks_mask(board: chess.Board, color: bool) -> int:
+    """
+    Returns the bitboard of all squares attacked by the given color:
+    the union of the attack sets of each of its pieces. Pawns are handled
+    as one set; every other piece uses its own attacks_mask.
+    """
+    pawns = board.pawns & board.occupied_co[color]
+    attacked = pawn_attacks_mask(pawns, color)
+    for square in chess.scan_reversed(board.occupied_co[color] & ~pawns):
+        attacked |= board.attacks_mask(square)
+    return attacked
+
+def squares_attacked(board: chess.Board, color: bool, attacks=None) -> int:
     """
     Counts how many squares on the board are attacked by the given color.
+    'attacks' may pass in attacks_mask(board, color) if it is already known.
     """
-    count = 0
-    for square in chess.SQUARES:
-        if board.is_attacked_by(color, square):
-            count += 1
-    return count
+    if attacks is None:
+        attacks = attacks_mask(board, color)
+    return chess.popcount(attacks)
 
-def pieces_attacked(board: chess.Board, color: bool) -> int:
+def pieces_attacked(board: chess.Board, color: bool, opp_attacks=None) -> int:
     """
     Counts how many pieces of 'color' are attacked by the *opposite* color.
+    'opp_attacks' may pass in attacks_mask(board, not color) if it is already known.
     """
-    opp_color = not color
-    count = 0
-    for square, piece in board.piece_map().items():
-        if piece.color == color:
-            # If this piece is attacked by the opponent
-            if board.is_attacked_by(opp_color, square):
-                count += 1
-    return count
+    if opp_attacks is None:
+        opp_attacks = attacks_mask(board, not color)
+    return chess.popcount(board.occupied_co[color] & opp_attacks)
 
 def squares_around_king(board: chess.Board, color: bool):
     """
@@ -47,62 +67,82 @@ def squares_around_king(board: chess.Board, color: bool):
     # Use precomputed bitboard for king moves.
     return list(chess.SquareSet(chess.BB_KING_ATTACKS[king_square]))
 
-def king_unsafe(board: chess.Board, color: bool) -> int:
+def king_unsafe(board: chess.Board, color: bool, opp_attacks=None) -> int:
     """
     Measures how "unsafe" the king is by counting how many squares around
     the king are attacked by the opponent.
+    'opp_attacks' may pass in attacks_mask(board, not color) if it is already known.
     """
-    opp_color = not color
-    king_zone = squares_around_king(board, color)
-    return sum(1 for sq in king_zone if board.is_attacked_by(opp_color, sq))
+    king_square = board.king(color)
+    if king_square is None:
+        return 0
+    if opp_attacks is None:
+        opp_attacks = attacks_mask(board, not color)
+    return chess.popcount(chess.BB_KING_ATTACKS[king_square] & opp_attacks)
 
-def degree_of_freedom(board: chess.Board, color: bool) -> int:
+def degree_of_freedom(board: chess.Board, color: bool, pseudo_legal=False) -> int:
     """
     Counts how many moves 'color' could make if it were that color's turn,
     regardless of whose turn it actually is.
+    With pseudo_legal=True, moves that would leave the king in check are
+    counted too: cheaper (no pin or check-evasion work), but the count can be
+    far higher when 'color' is in check.
     """
-    board_copy = board.copy()
-    board_copy.turn = color
-    return board_copy.legal_moves.count()
-
-def extract_features(board: chess.Board):
+    # Flip the side to move in place rather than copying the board;
+    # counting moves does not change any other state.
+    saved_turn = board.turn
+    board.turn = color
+    try:
+        if pseudo_legal:
+            return board.pseudo_legal_moves.count()
+        return board.legal_moves.count()
+    finally:
+        board.turn = saved_turn
+
+def extract_features(board: chess.Board, pseudo_legal_mobility=False):
     """
     Returns a more 'dense' list of numeric features representing the board.
+    pseudo_legal_mobility=True approximates the degree-of-freedom feature with
+    pseudo-legal move counts (see degree_of_freedom).
     """
 
     # 1. Material Balance
     white_material = 0
     black_material = 0
-    for piece_type, value in PIECE_VALUES.items():
-        white_material += len(board.pieces(piece_type, chess.WHITE)) * value
-        black_material += len(board.pieces(piece_type, chess.BLACK)) * value
+    for piece_type, value in zip(chess.PIECE_TYPES, PIECE_VALUE_ARR):
+        white_material += chess.popcount(board.pieces_mask(piece_type, chess.WHITE)) * value
+        black_material += chess.popcount(board.pieces_mask(piece_type, chess.BLACK)) * value
     material_balance = white_material - black_material
 
     # 2. Total Pieces
-    total_pieces = len(board.piece_map())
+    total_pieces = chess.popcount(board.occupied)
 
     # 3. Number of Moves Available (for whoever is to move right now)
     moves_available = board.legal_moves.count()
 
+    # Attack bitboards of both colors, shared by features 4-6
+    white_attacks = attacks_mask(board, chess.WHITE)
+    black_attacks = attacks_mask(board, chess.BLACK)
+
     # 4. Squares Attacked by White vs. Black
-    white_attacked_squares = squares_attacked(board, chess.WHITE)
-    black_attacked_squares = squares_attacked(board, chess.BLACK)
+    white_attacked_squares = squares_attacked(board, chess.WHITE, white_attacks)
+    black_attacked_squares = squares_attacked(board, chess.BLACK, black_attacks)
     attacked_squares_diff = white_attacked_squares - black_attacked_squares
 
     # 5. Pieces Attacked (White vs. Black)
-    white_pieces_under_attack = pieces_attacked(board, chess.WHITE)
-    black_pieces_under_attack = pieces_attacked(board, chess.BLACK)
+    white_pieces_under_attack = pieces_attacked(board, chess.WHITE, black_attacks)
+    black_pieces_under_attack = pieces_attacked(board, chess.BLACK, white_attacks)
     pieces_attacked_diff = white_pieces_under_attack - black_pieces_under_attack
 
     # 6. King Safety (count how many squares around each king are attacked)
-    white_king_unsafe = king_unsafe(board, chess.WHITE)
-    black_king_unsafe = king_unsafe(board, chess.BLACK)
+    white_king_unsafe = king_unsafe(board, chess.WHITE, black_attacks)
+    black_king_unsafe = king_unsafe(board, chess.BLACK, white_attacks)
     # Define a difference (positive means black king is more in danger):
     king_safety_diff = black_king_unsafe - white_king_unsafe
 
     # 7. Degree of Freedom (sum of possible moves for White vs. Black)
-    white_dof = degree_of_freedom(board, chess.WHITE)
-    black_dof = degree_of_freedom(board, chess.BLACK)
+    white_dof = degree_of_freedom(board, chess.WHITE, pseudo_legal_mobility)
+    black_dof = degree_of_freedom(board, chess.BLACK, pseudo_legal_mobility)
     dof_diff = white_dof - black_dof
 
     # Return them all as a feature vector
@@ -120,7 +160,13 @@ def feature_distance(board1: chess.Board, board2: chess.Board):
     """
     Computes the Euclidean distance between two boards in the new feature space.
     """
-    f1 = extract_features(board1)
+    return feature_distance_from(extract_features(board1), board2)
+
+def feature_distance_from(f1, board2: chess.Board):
+    """
+    Same as feature_distance, but with the first board's features already
+    extracted, for comparing one board against many.
+    """
     f2 = extract_features(board2)
     p = 2
     return sum(abs(x - y)**p for x, y in zip(f1, f2))**(1.0 / p)
@@ -151,9 +197,11 @@ def get_engine_eval(board: chess.Board, depth=15) -> float:
     return score
 
 
-def demo_feature_distance(board_a, board_b):    
+def demo_feature_distance(board_a, board_b, features_a=None):    
     # Compute distance
-    dist = feature_distance(board_a, board_b)
+    if features_a is None:
+        features_a = extract_features(board_a)
+    dist = feature_distance_from(features_a, board_b)
     #print("Distance (feature-based):", dist)
 
     #eval_a = get_engine_eval(board_a, depth=15)
@@ -11,15 +11,36 @@ def clamp_eval(eval_cp, lower=-2000, upper=2000):
     """
     return max(lower, min(upper, eval_cp))
 
+# Engine evaluations keyed by (EPD, depth). The EPD leaves out the move counters, so
+# the same position reached at a different move number is not searched again; the
+# engine is not part of the key, so every engine in the process shares the entries.
+_EVAL_CACHE_MAXSIZE = 4096
+_eval_cache = {}
+
+def _eval_board(board: chess.Board, engine: chess.engine.SimpleEngine, depth: int) -> int:
+    """
+    Engine evaluation of 'board' in centipawns from White’s perspective,
+    cached so that a position seen again is not re-analyzed.
+    """
+    key = (board.epd(), depth)
+    eval_cp = _eval_cache.get(key)
+    if eval_cp is None:
+        info = engine.analyse(board, limit=chess.engine.Limit(depth=depth))
+        # Mate scores are converted to large +/-
+        eval_cp = info["score"].white().score(mate_score=100000)
+        if len(_eval_cache) >= _EVAL_CACHE_MAXSIZE:
+            # Evict the oldest entry
+            del _eval_cache[next(iter(_eval_cache))]
+        _eval_cache[key] = eval_cp
+    return eval_cp
+
 def compute_outcome_distribution(board: chess.Board, engine: chess.engine.SimpleEngine, depth=20):
     """
     Returns a 3-element list: [p_white_win, p_draw, p_black_win],
     derived from the engine's centipawn evaluation from White’s perspective.
     """
     # 1) Get engine evaluation in centipawns from White’s perspective
-    info = engine.analyse(board, limit=chess.engine.Limit(depth=depth))
-    # Mate scores are converted to large +/-
-    eval_cp = info["score"].white().score(mate_score=100000)  
+    eval_cp = _eval_board(board, engine, depth)
 
     # 2) Clamp the eval
     e = clamp_eval(eval_cp)
@@ -54,11 +75,10 @@ def compute_outcome_distribution(board: chess.Board, engine: chess.engine.Simple
 def kl_divergence(p, q):
     """
     Kullback-Leibler divergence D_KL(P || Q).
-    p, q are probability lists.
+    p, q are probability sequences; terms with p_i == 0 contribute 0.
     """
-    epsilon = 1e-12  # guard against log(0)
     return sum(
-        p_i * math.log((p_i + epsilon) / (q_i + epsilon), 2)
+        p_i * math.log2(p_i / q_i)
         for p_i, q_i in zip(p, q)
         if p_i > 0
     )
@@ -67,30 +87,37 @@ def jensen_shannon_distance(p, q):
     """
     JS distance = sqrt(JS divergence).
     Where JS(P,Q) = 0.5 * KL(P||M) + 0.5 * KL(Q||M), M = 0.5(P+Q).
-    p, q are probability lists (sum to 1).
+    p, q are probability lists (sum to 1). M > 0 wherever P or Q is, so no
+    epsilon is needed.
     """
-    m = [(p_i + q_i) / 2.0 for p_i, q_i in zip(p, q)]
+    m = [0.5 * (p_i + q_i) for p_i, q_i in zip(p, q)]
     js_div = 0.5 * kl_divergence(p, m) + 0.5 * kl_divergence(q, m)
-    return math.sqrt(js_div)
+    # Rounding can leave a tiny negative value for identical distributions
+    return math.sqrt(max(js_div, 0.0))
 
 ###################################
 # 3. Final Info Distance
 ###################################
-def info_distance(board1: chess.Board, board2: chess.Board, engine: chess.engine.SimpleEngine, depth=20):
+def info_distance(board1: chess.Board, board2: chess.Board, engine: chess.engine.SimpleEngine, depth=20, dist1=None):
     """
     Computes an information-theoretic distance between board1 and board2,
     by comparing [p_white, p_draw, p_black] distributions.
+    If board1's distribution is already known (e.g. board1 is compared against many boards),
+    pass it as dist1 to skip re-analyzing board1.
     """
-    dist1 = compute_outcome_distribution(board1, engine, depth=depth)
+    if dist1 is None:
+        dist1 = compute_outcome_distribution(board1, engine, depth=depth)
     dist2 = compute_outcome_distribution(board2, engine, depth=depth)
     return jensen_shannon_distance(dist1, dist2)
 
 ###################################
 # 4. Demo
 ###################################
-def main_demo_info_distance(board_a, board_b, engine_path="/opt/homebrew/bin/stockfish"):
-    # 1) Create the engine
-    engine = chess.engine.SimpleEngine.popen_uci(engine_path)
+def main_demo_info_distance(board_a, board_b, engine_path="/opt/homebrew/bin/stockfish", engine=None, dist_a=None, depth=20):
+    # 1) Create the engine, unless the caller keeps one running across calls
+    own_engine = engine is None
+    if own_engine:
+        engine = chess.engine.SimpleEngine.popen_uci(engine_path)
 
     # # 2) Make two random boards
     # board_a = chess.Board()
@@ -110,7 +137,7 @@ def main_demo_info_distance(board_a, board_b, engine_path="/opt/homebrew/bin/sto
     # print("Board B FEN:", board_b.fen())
 
     # 3) Compute info distance
-    dist = info_distance(board_a, board_b, engine, depth=20)
+    dist = info_distance(board_a, board_b, engine, depth=depth, dist1=dist_a)
     # print(f"Information-based distance = {js_dist:.4f}")
 
     # # 4) Optional: see the distributions themselves
@@ -119,8 +146,9 @@ def main_demo_info_distance(board_a, board_b, engine_path="/opt/homebrew/bin/sto
     # print("distA = [P(white_win), P(draw), P(black_win)] =", distA)
     # print("distB = [P(white_win), P(draw), P(black_win)] =", distB)
 
-    # Shutdown engine
-    engine.quit()
+    # Shutdown engine (only if we started it)
+    if own_engine:
+        engine.quit()
     return dist
 
 # if __name__ == "__main__":
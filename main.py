@@ -1,11 +1,13 @@
-from feature_distance import demo_feature_distance
-from jensen_shanon_distance import main_demo_info_distance
-from physical_board_distance import demo_piecewise_distance
+from feature_distance import demo_feature_distance, extract_features
+from jensen_shanon_distance import main_demo_info_distance, compute_outcome_distribution
+from physical_board_distance import demo_piecewise_distance, piece_square_arrays
 import chess
 import random
 import math
 import chess.svg
 import chess.engine
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.util import Finalize
 
 def random_board(num_moves=5):
     """
@@ -14,10 +16,13 @@ def random_board(num_moves=5):
     """
     board = chess.Board()
     for _ in range(num_moves):
-        if board.is_game_over():
+        # Generate the legal moves once per ply: an empty list is checkmate or stalemate,
+        # so only the remaining game-over rules of is_game_over() need checking.
+        moves = list(board.legal_moves)
+        if (not moves or board.is_insufficient_material()
+                or board.is_seventyfive_moves() or board.is_fivefold_repetition()):
             break
-        move = random.choice(list(board.legal_moves))
-        board.push(move)
+        board.push(random.choice(moves))
     # Force White to move next
     board.turn = chess.WHITE
     return board
@@ -34,60 +39,102 @@ def check_pawn_structure(boardA: chess.Board, boardB: chess.Board):
     Otherwise returns False.
     """
     
-    # 1. Gather White pawns
-    white_pawns_A = sorted(boardA.pieces(chess.PAWN, chess.WHITE))
-    white_pawns_B = sorted(boardB.pieces(chess.PAWN, chess.WHITE))
-    
-    # 2. Gather Black pawns
-    black_pawns_A = sorted(boardA.pieces(chess.PAWN, chess.BLACK))
-    black_pawns_B = sorted(boardB.pieces(chess.PAWN, chess.BLACK))
-    
-    # If the counts differ, decide how you want to handle it.
-    # For now, let's only compare up to the min() of both sets.
-    # The rest are effectively "unmatched" pawns.
-    
-    # White check
-    n_white = min(len(white_pawns_A), len(white_pawns_B))
-    for i in range(n_white):
-        sqA = white_pawns_A[i]  # 0..63
-        sqB = white_pawns_B[i]
-        rankA, fileA = divmod(sqA, 8)  # rank = 0..7
-        rankB, fileB = divmod(sqB, 8)
-        
-        # For White, we want rankB >= rankA
-        if rankB < rankA:
-            return False  # a white pawn has "gone backward"
-    
-    # Black check
-    n_black = min(len(black_pawns_A), len(black_pawns_B))
-    for i in range(n_black):
-        sqA = black_pawns_A[i]
-        sqB = black_pawns_B[i]
-        rankA, fileA = divmod(sqA, 8)
-        rankB, fileB = divmod(sqB, 8)
-        
-        # For Black, we want rankB <= rankA
-        if rankB > rankA:
-            return False  # a black pawn has "gone backward"
-    
+    # Pawns are paired in ascending square order, which chess.scan_forward yields
+    # directly from the bitboards; a square's rank is square >> 3.
+    # If the counts differ, only the first min() of each color are compared:
+    # zip() stops at the shorter side, the rest are effectively "unmatched" pawns.
+
+    # White check: rankB >= rankA, otherwise a white pawn has "gone backward"
+    white_A = boardA.pieces_mask(chess.PAWN, chess.WHITE)
+    white_B = boardB.pieces_mask(chess.PAWN, chess.WHITE)
+    for sqA, sqB in zip(chess.scan_forward(white_A), chess.scan_forward(white_B)):
+        if sqB >> 3 < sqA >> 3:
+            return False
+
+    # Black check: rankB <= rankA, otherwise a black pawn has "gone backward"
+    black_A = boardA.pieces_mask(chess.PAWN, chess.BLACK)
+    black_B = boardB.pieces_mask(chess.PAWN, chess.BLACK)
+    for sqA, sqB in zip(chess.scan_forward(black_A), chess.scan_forward(black_B)):
+        if sqB >> 3 > sqA >> 3:
+            return False
+
     # If we get here, there's no direct "backward movement" violation
     return True
 
-min_dist = 10000
-board_a = random_board(num_moves=18)
-for _ in range(1000):
+ENGINE_PATH = "/opt/homebrew/bin/stockfish"
+# Candidates are screened with a cheap search; only the winner is re-scored at full depth.
+SCREEN_DEPTH = 10
+FINAL_DEPTH = 20
+# Skip candidates whose pawns moved backward relative to board_a before computing any distance
+REQUIRE_PAWN_STRUCTURE = False
+
+N_CANDIDATES = 1000
+
+# Per-worker state, filled in by _init_worker: each worker process holds its own
+# persistent engine and board_a's precomputed features, squares and outcome distribution.
+_worker = {}
+
+def _init_worker(board_a_fen):
+    board_a = chess.Board(board_a_fen)
+    # The engine lives as long as the worker. python-chess drives it from a non-daemon
+    # thread, so it must be quit explicitly or the worker process can never exit;
+    # the finalizer runs when the worker shuts down, before its threads are joined.
+    engine = chess.engine.SimpleEngine.popen_uci(ENGINE_PATH)
+    Finalize(engine, engine.quit, exitpriority=10)
+    _worker.update(
+        board_a=board_a,
+        engine=engine,
+        features_a=extract_features(board_a),
+        squares_a=piece_square_arrays(board_a),
+        dist_a_outcome=compute_outcome_distribution(board_a, engine, depth=SCREEN_DEPTH),
+    )
+
+def evaluate_candidate(seed):
+    """
+    Builds the candidate board_b for 'seed' and returns (total_dist, board_b FEN),
+    or None if it is filtered out by the pawn-structure check.
+    """
+    random.seed(seed)
+    board_a = _worker["board_a"]
     board_b = random_board(num_moves=18)
-    #if check_pawn_structure(board_a, board_b) == True:
-    dist_feature = demo_feature_distance(board_a, board_b)/40
-    dist_physical_board = demo_piecewise_distance(board_a, board_b)/10
-    dist_jensen_shanon = main_demo_info_distance(board_a, board_b)
-    total_dist = dist_feature + dist_physical_board + dist_jensen_shanon
-    if min_dist > total_dist:
-        min_dist = total_dist
-        print("new min dist found", total_dist)
-        svg_code_a = chess.svg.board(board=board_a, orientation=chess.WHITE)
-        svg_code_b = chess.svg.board(board=board_b, orientation=chess.WHITE)
-        with open("board_a.svg", "w") as f:
-            f.write(svg_code_a)
-        with open("board_b.svg", "w") as f:
-            f.write(svg_code_b)
\ No newline at end of file
+    if REQUIRE_PAWN_STRUCTURE and not check_pawn_structure(board_a, board_b):
+        return None
+    dist_feature = demo_feature_distance(board_a, board_b, _worker["features_a"])/40
+    dist_physical_board = demo_piecewise_distance(board_a, board_b, _worker["squares_a"])/10
+    dist_jensen_shanon = main_demo_info_distance(board_a, board_b, engine=_worker["engine"],
+                                                 dist_a=_worker["dist_a_outcome"], depth=SCREEN_DEPTH)
+    return dist_feature + dist_physical_board + dist_jensen_shanon, board_b.fen()
+
+if __name__ == "__main__":
+    min_dist = 10000
+    board_a = random_board(num_moves=18)
+    best_board_b = None
+    # Candidates are independent: screen them across worker processes, then reduce to the min here.
+    first_seed = random.randrange(2**32)
+    with ProcessPoolExecutor(initializer=_init_worker, initargs=(board_a.fen(),)) as executor:
+        candidates = executor.map(evaluate_candidate, range(first_seed, first_seed + N_CANDIDATES), chunksize=16)
+        for result in candidates:
+            if result is None:
+                continue
+            total_dist, fen_b = result
+            if min_dist > total_dist:
+                min_dist = total_dist
+                best_board_b = chess.Board(fen_b)
+                print("new min dist found", total_dist)
+                svg_code_a = chess.svg.board(board=board_a, orientation=chess.WHITE)
+                svg_code_b = chess.svg.board(board=best_board_b, orientation=chess.WHITE)
+                with open("board_a.svg", "w") as f:
+                    f.write(svg_code_a)
+                with open("board_b.svg", "w") as f:
+                    f.write(svg_code_b)
+
+    # Re-score the best candidate with the full-depth search
+    if best_board_b is not None:
+        engine = chess.engine.SimpleEngine.popen_uci(ENGINE_PATH)
+        try:
+            min_dist = (demo_feature_distance(board_a, best_board_b)/40
+                        + demo_piecewise_distance(board_a, best_board_b)/10
+                        + main_demo_info_distance(board_a, best_board_b, engine=engine, depth=FINAL_DEPTH))
+        finally:
+            engine.quit()
+        print("min dist at depth", FINAL_DEPTH, min_dist)
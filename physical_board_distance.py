@@ -1,6 +1,8 @@
 import chess
 import random
 import math
+import numpy as np
+from scipy.optimize import linear_sum_assignment
 from collections import deque
 
 # --- Offsets ---
@@ -77,6 +79,51 @@ def bfs_min_steps_knight(start_sq, end_sq):
                     queue.append((nr, nc, dist + 1))
     return 64
 
+# --- Precomputed distance tables ---
+_RANKS, _FILES = np.divmod(np.arange(64), 8)
+
+def step_matrix(offsets, can_repeat=True):
+    """
+    64x64 boolean matrix: [a, b] is True when the piece reaches b from a in one move on an empty board.
+    """
+    step = np.zeros((64, 64), dtype=bool)
+    for (dr, dc) in offsets:
+        for k in range(1, 8 if can_repeat else 2):
+            r, c = _RANKS + k * dr, _FILES + k * dc
+            ok = (r >= 0) & (r < 8) & (c >= 0) & (c < 8)
+            step[np.flatnonzero(ok), (r * 8 + c)[ok]] = True
+    return step
+
+def build_distance_table(offsets, can_repeat=True):
+    """
+    Return a 64x64 uint8 table of empty-board step counts, indexed [from_sq, to_sq] (64 if unreachable,
+    as bfs_min_steps returns). Runs the BFS from all 64 squares at once: each level's frontier is the
+    boolean product of the previous frontier with the one-move step matrix.
+    """
+    step = step_matrix(offsets, can_repeat).astype(np.int16)
+    dist = np.full((64, 64), 64, dtype=np.uint8)
+    reached = np.eye(64, dtype=bool)
+    frontier = reached
+    level = 0
+    np.fill_diagonal(dist, 0)
+    while frontier.any():
+        level += 1
+        frontier = ((frontier.astype(np.int16) @ step) > 0) & ~reached
+        dist[frontier] = level
+        reached |= frontier
+    return dist
+
+# Empty-board step counts for every (from, to) pair, filled once at import. Pawns use the
+# 'file + rank difference' rule from piece_movement_distance, which only depends on the squares.
+DIST = {
+    chess.PAWN:   (np.abs(_RANKS[:, None] - _RANKS) + np.abs(_FILES[:, None] - _FILES)).astype(np.uint8),
+    chess.KNIGHT: build_distance_table(KNIGHT_OFFSETS, can_repeat=False),
+    chess.BISHOP: build_distance_table(generate_offsets_bishop(), can_repeat=True),
+    chess.ROOK:   build_distance_table(generate_offsets_rook(), can_repeat=True),
+    chess.QUEEN:  build_distance_table(generate_offsets_queen(), can_repeat=True),
+    chess.KING:   build_distance_table(KING_OFFSETS, can_repeat=False),
+}
+
 # --- Piece Weights (for final weighted average) ---
 # You can tune the King’s “weight” if you wish—traditionally King = infinite in real chess,
 # but we’ll treat it as 10 for the sake of relative weighting.
@@ -98,69 +145,70 @@ def piece_movement_distance(piece_type: chess.PieceType, from_sq: chess.Square,
     if from_sq == to_sq:
         return 0
 
-    # Pawn special handling (requested simplification)
-    if piece_type == chess.PAWN:
-        from_rank, from_file = square_to_coords(from_sq)
-        to_rank, to_file = square_to_coords(to_sq)
-        if from_file != to_file:
-            # If different file, big penalty or sum of file+rank diff
-            return abs(from_file - to_file) + abs(from_rank - to_rank)
-        else:
-            return abs(to_rank - from_rank)
-
-    # Knight
-    if piece_type == chess.KNIGHT:
-        return bfs_min_steps_knight(from_sq, to_sq)
-
-    # King
-    if piece_type == chess.KING:
-        return bfs_min_steps(from_sq, to_sq, KING_OFFSETS, can_repeat=False)
-
-    # Bishop
-    if piece_type == chess.BISHOP:
-        return bfs_min_steps(from_sq, to_sq, generate_offsets_bishop(), can_repeat=True)
-
-    # Rook
-    if piece_type == chess.ROOK:
-        return bfs_min_steps(from_sq, to_sq, generate_offsets_rook(), can_repeat=True)
-
-    # Queen
-    if piece_type == chess.QUEEN:
-        return bfs_min_steps(from_sq, to_sq, generate_offsets_queen(), can_repeat=True)
+    # All piece types, pawns included, are precomputed in DIST
+    table = DIST.get(piece_type)
+    if table is not None:
+        return int(table[from_sq, to_sq])
 
     # Default
     return 0
 
-def piecewise_distance(board1: chess.Board, board2: chess.Board) -> float:
+def sorted_squares(board: chess.Board, piece_type: chess.PieceType, color: chess.Color):
+    """
+    Squares of the given piece as a list in ascending order, read straight off
+    the bitboard (chess.scan_forward already yields ascending squares, so no sort is needed).
+    """
+    return list(chess.scan_forward(board.pieces_mask(piece_type, color)))
+
+def piece_square_arrays(board: chess.Board):
+    """
+    Returns {(color, piece_type): list of that piece's squares in ascending order}.
+    Compute it once for a board that is compared against many others.
+    """
+    return {
+        (color, piece_type): sorted_squares(board, piece_type, color)
+        for color in [chess.WHITE, chess.BLACK]
+        for piece_type in range(chess.PAWN, chess.KING + 1)
+    }
+
+def piecewise_distance(board1: chess.Board, board2: chess.Board, squares_a=None) -> float:
     """
     Computes a weighted average of piecewise "movement distance."
-    For each (color, piece_type), we pair up pieces, compute BFS-based distance,
-    multiply by piece weight, and sum. Then we divide by the sum of piece weights
+    For each (color, piece_type), we pair up pieces so that their total BFS-based
+    distance is minimal, multiply by piece weight, and sum. Then we divide by the sum of piece weights
     to get an average.
+    'squares_a' may pass in piece_square_arrays(board1) if it is already known.
     """
+    if squares_a is None:
+        squares_a = piece_square_arrays(board1)
     total_weighted_dist = 0.0
     total_weights = 0.0
+    # Each unmatched piece adds a penalty (e.g., 3 steps) times its piece weight
+    penalty_distance = 3.0
 
     for color in [chess.WHITE, chess.BLACK]:
         for piece_type in range(chess.PAWN, chess.KING + 1):
-            squares1 = sorted(board1.pieces(piece_type, color))
-            squares2 = sorted(board2.pieces(piece_type, color))
+            squares1 = squares_a[color, piece_type]
+            squares2 = sorted_squares(board2, piece_type, color)
 
             w = PIECE_WEIGHTS[piece_type]  # weight for this piece type
-            # Pair them
+            # Optimal pairing: min-cost assignment on the (n1 x n2) distance matrix;
+            # with n1 != n2 the surplus pieces stay unmatched
             n = min(len(squares1), len(squares2))
-            for i in range(n):
-                sq1 = squares1[i]
-                sq2 = squares2[i]
-                dist = piece_movement_distance(piece_type, sq1, sq2)
-                # Weighted by piece value
-                total_weighted_dist += dist * w
+            if n == 1:
+                # A lone piece on either side is matched to its nearest counterpart;
+                # scalar table lookups are cheaper than the assignment at this size
+                table = DIST[piece_type]
+                total_weighted_dist += min(int(table[sq1, sq2]) for sq1 in squares1 for sq2 in squares2) * w
                 total_weights += w
+            elif n:
+                cost = DIST[piece_type][np.ix_(squares1, squares2)]
+                rows, cols = linear_sum_assignment(cost)
+                total_weighted_dist += int(cost[rows, cols].sum()) * w
+                total_weights += n * w
 
             # Unmatched pieces penalty
             diff = abs(len(squares1) - len(squares2))
-            # Each unmatched piece adds a penalty (e.g., 3 steps) times its piece weight
-            penalty_distance = 3.0
             total_weighted_dist += diff * penalty_distance * w
             total_weights += diff * w
 
@@ -180,11 +228,11 @@ def random_board(num_moves=5):
     board.turn = chess.WHITE
     return board
 
-def demo_piecewise_distance(board_a, board_b):
+def demo_piecewise_distance(board_a, board_b, squares_a=None):
     # board_a = random_board(num_moves=5)
     # board_b = random_board(num_moves=5)
 
-    dist = piecewise_distance(board_a, board_b)
+    dist = piecewise_distance(board_a, board_b, squares_a)
     # print("Board A:", board_a)
     # print("Board B:", board_b)
     # print("Weighted avg piecewise distance =", dist)
@@ -2,14 +2,18 @@ import chess
 import random
 import math
 import chess.svg
-import heapq
+import chess.polyglot
+from collections import deque
 
 # 1) Move cost function
+# Largest possible move_cost (capture + promotion)
+MAX_MOVE_COST = 3.0
+
 def move_cost(board, move):
-    temp_board = board.copy()
-    is_capture = temp_board.is_capture(move)
+    # is_capture / is_castling only read the board, so no copy is needed
+    is_capture = board.is_capture(move)
     promo = (move.promotion is not None)
-    is_castle = temp_board.is_castling(move)
+    is_castle = board.is_castling(move)
 
     cost = 1.0  # base cost for quiet move
     if is_capture:
@@ -23,38 +27,51 @@ def move_cost(board, move):
 
 # 2) Position signature
 def position_signature(board):
-    return board.fen()
+    # 64-bit Zobrist hash: cheap to hash and compare as a dict key, and unlike the FEN
+    # it ignores the move counters, so reaching the goal position by a different
+    # number of moves still counts.
+    return chess.polyglot.zobrist_hash(board)
 
 # 3) Weighted move distance (Dijkstra with depth limit)
 def weighted_move_distance(board1, board2, max_depth=4):
-    start_fen = position_signature(board1)
-    goal_fen = position_signature(board2)
-    if start_fen == goal_fen:
+    start_sig = position_signature(board1)
+    goal_sig = position_signature(board2)
+    if start_sig == goal_sig:
         return 0.0
 
-    # Priority queue: (cost_so_far, depth, board)
-    pq = [(0.0, 0, board1)]
-    visited_cost = {start_fen: 0.0}
-
-    while pq:
-        current_cost, depth, current_board = heapq.heappop(pq)
-        current_fen = position_signature(current_board)
-
-        if current_fen == goal_fen:
-            return current_cost
-
-        if depth < max_depth:
-            for move in current_board.legal_moves:
-                move_c = move_cost(current_board, move)
-
-                next_board = current_board.copy()
-                next_board.push(move)
-                next_fen = position_signature(next_board)
-
-                new_cost = current_cost + move_c
-                if next_fen not in visited_cost or new_cost < visited_cost[next_fen]:
-                    visited_cost[next_fen] = new_cost
-                    heapq.heappush(pq, (new_cost, depth + 1, next_board))
+    # Every move_cost is a multiple of 0.5 between 1.0 and MAX_MOVE_COST, so doubled path
+    # costs are small integers: the frontier is kept in one FIFO bucket per doubled cost
+    # (Dial's algorithm) and scanned in increasing order instead of going through a heap.
+    # Entries hold the move path from board1 instead of a board copy; the path is replayed
+    # onto a single scratch board when popped (at most max_depth moves).
+    scratch = board1.copy()
+    buckets = [deque() for _ in range(int(2 * MAX_MOVE_COST) * max_depth + 1)]
+    buckets[0].append((start_sig, ()))
+    visited_cost = {start_sig: 0}
+
+    for current_cost, bucket in enumerate(buckets):
+        while bucket:
+            current_sig, path = bucket.popleft()
+
+            if current_sig == goal_sig:
+                return current_cost / 2.0
+
+            if len(path) < max_depth:
+                for move in path:
+                    scratch.push(move)
+                for move in list(scratch.legal_moves):
+                    move_c = int(2 * move_cost(scratch, move))
+
+                    scratch.push(move)
+                    next_sig = position_signature(scratch)
+                    scratch.pop()
+
+                    new_cost = current_cost + move_c
+                    if next_sig not in visited_cost or new_cost < visited_cost[next_sig]:
+                        visited_cost[next_sig] = new_cost
+                        buckets[new_cost].append((next_sig, path + (move,)))
+                for _ in path:
+                    scratch.pop()
 
     return None  # Not found within max_depth
 
@@ -19,50 +19,91 @@ Version: 1.0.0
 Date: March 4, 2025
 """
 
+import logging
+from contextlib import nullcontext
 import networkx as nx
 import numpy as np
-import math
 import chess
-from typing import Dict, List, Tuple, Set, Any, Optional, Union
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple, Set, Any, Optional, Union
 from positional_graph import PositionalGraph
-from cdlib import algorithms, evaluation
+import igraph as ig
+import leidenalg
+
+
+logger = logging.getLogger(__name__)
 
 
 # --- Component Analysis Functions ---
 
-def decompose_into_components(G: nx.DiGraph, component_type: str = 'weak') -> List[nx.DiGraph]:
+def iter_components(G: nx.DiGraph, component_type: str = 'weak') -> Iterator[nx.DiGraph]:
     """
-    Decompose a directed graph into its disconnected components.
+    Lazily yield the disconnected components of a directed graph.
     
     Args:
         G: The directed graph to decompose
         component_type: 'weak' for weakly connected components or 'strong' for strongly connected components
         
-    Returns:
-        A list of DiGraph objects, each representing a component
+    Yields:
+        A read-only subgraph view of G for each component
     """
     if component_type == 'strong':
-        components = [G.subgraph(c).copy() for c in nx.strongly_connected_components(G)]
+        node_sets = nx.strongly_connected_components(G)
     else:
-        components = [G.subgraph(c).copy() for c in nx.weakly_connected_components(G)]
-    return components
+        node_sets = nx.weakly_connected_components(G)
+    
+    for c in node_sets:
+        yield G.subgraph(c)
 
 
-def verify_no_intercomponent_edges(G: nx.DiGraph, components: List[nx.DiGraph]) -> bool:
+def decompose_into_components(
+    G: nx.DiGraph, 
+    component_type: str = 'weak',
+    copy: bool = True
+) -> Tuple[List[nx.DiGraph], Dict[Any, int]]:
+    """
+    Decompose a directed graph into its disconnected components.
+    
+    Args:
+        G: The directed graph to decompose
+        component_type: 'weak' for weakly connected components or 'strong' for strongly connected components
+        copy: If False, return read-only subgraph views of G instead of copies
+        
+    Returns:
+        Tuple containing:
+        - A list of DiGraph objects, each representing a component
+        - Dictionary mapping each node to the index of its component
+    """
+    components = []
+    node_to_component = {}
+    for idx, sub in enumerate(iter_components(G, component_type)):
+        node_to_component.update(dict.fromkeys(sub, idx))
+        components.append(sub.copy() if copy else sub)
+    return components, node_to_component
+
+
+def verify_no_intercomponent_edges(
+    G: nx.DiGraph, 
+    components: List[nx.DiGraph],
+    node_to_component: Optional[Dict[Any, int]] = None
+) -> bool:
     """
     Verify that there are no edges between components.
     
     Args:
         G: The original graph
         components: The list of component subgraphs
+        node_to_component: Optional node-to-component index map as returned by
+            decompose_into_components; built from components when not given
         
     Returns:
         True if there are no edges between components, False otherwise
     """
-    node_to_component = {}
-    for idx, comp in enumerate(components):
-        for node in comp.nodes():
-            node_to_component[node] = idx
+    if node_to_component is None:
+        node_to_component = {}
+        for idx, comp in enumerate(components):
+            for node in comp.nodes():
+                node_to_component[node] = idx
     
     for u, v in G.edges():
         if node_to_component.get(u) != node_to_component.get(v):
@@ -70,6 +111,31 @@ def verify_no_intercomponent_edges(G: nx.DiGraph, components: List[nx.DiGraph])
     return True
 
 
+def compute_component_weights(
+    components: List[nx.DiGraph], 
+    exponent: float = 2,
+    sizes: Optional[List[int]] = None
+) -> np.ndarray:
+    """
+    Compute the normalized power-law weights used by the aggregate_* functions.
+    
+    Args:
+        components: List of component subgraphs
+        exponent: Power-law exponent for weighting (larger components have more influence)
+        sizes: Optional precomputed node counts of the components (same order as components)
+        
+    Returns:
+        Array of per-component weights (size ** exponent) summing to 1
+    """
+    if sizes is None:
+        sizes = [comp.number_of_nodes() for comp in components]
+    weights = np.asarray(sizes, dtype=np.float64) ** exponent
+    total_weight = weights.sum()
+    if total_weight > 0:
+        weights /= total_weight
+    return weights
+
+
 # --- Fiedler Value Functions ---
 
 def compute_fiedler_value(G: nx.DiGraph) -> Optional[float]:
@@ -88,46 +154,105 @@ def compute_fiedler_value(G: nx.DiGraph) -> Optional[float]:
     if G.number_of_nodes() < 2:
         return None
     
+    # The directed (Chung) Laplacian is symmetric, so only the real symmetric
+    # eigenproblem needs solving
     L = nx.directed_laplacian_matrix(G)
     try:
         L = L.toarray()
     except AttributeError:
         pass
     
-    eigenvalues = np.linalg.eigvals(L)
-    eigenvalues_sorted = sorted(eigenvalues, key=lambda x: x.real)
-    
-    if len(eigenvalues_sorted) < 2:
-        return None
-    
-    return eigenvalues_sorted[1].real
+    eigenvalues = np.linalg.eigvalsh(L)  # ascending order
+    return eigenvalues[1]
 
 
-def aggregate_fiedler_value_power(components: List[nx.DiGraph], exponent: float = 2) -> float:
+def aggregate_fiedler_value_power(
+    components: List[nx.DiGraph], 
+    exponent: float = 2,
+    values: Optional[List[Optional[float]]] = None,
+    weights: Optional[np.ndarray] = None
+) -> float:
     """
     Aggregate Fiedler values across components using power-law weighting.
     
     Args:
         components: List of component subgraphs
         exponent: Power-law exponent for weighting (larger components have more influence)
+        values: Optional precomputed per-component Fiedler values (same order as components);
+            when given, they are used instead of recomputing them
+        weights: Optional precomputed weights from compute_component_weights;
+            when given, exponent is ignored
         
     Returns:
         Weighted average of Fiedler values across components
     """
-    total_weight = sum(comp.number_of_nodes() ** exponent for comp in components)
-    aggregated_value = 0.0
-    
-    for comp in components:
-        weight = comp.number_of_nodes() ** exponent
-        fiedler = compute_fiedler_value(comp)
-        if fiedler is not None:
-            aggregated_value += (weight / total_weight) * fiedler
-    
-    return aggregated_value
+    if weights is None:
+        weights = compute_component_weights(components, exponent)
+    if values is None:
+        values = [compute_fiedler_value(comp) for comp in components]
+    
+    # Components without a Fiedler value contribute nothing
+    fiedlers = np.array([0.0 if f is None else f for f in values], dtype=np.float64)
+    return float(weights @ fiedlers)
 
 
 # --- Diameter Analysis Functions ---
 
+def compute_distance_matrix(
+    G: nx.DiGraph, 
+    reverse: bool = False,
+    cutoff: Optional[int] = None
+) -> Tuple[np.ndarray, List[Any]]:
+    """
+    Compute all-pairs shortest path lengths (in edges) of a directed graph.
+    
+    A breadth-first search runs from every node at the same time on the adjacency
+    matrix: row s of the frontier holds the nodes first reached from s at the
+    current level, and one matrix product advances every row by one level.
+    
+    Args:
+        G: The directed graph
+        reverse: If True, follow edges against their direction
+        cutoff: Optional maximum distance to search; pairs farther apart are
+            reported as unreachable
+        
+    Returns:
+        Tuple containing:
+        - n x n int32 matrix where [i, j] is the distance from nodes[i] to nodes[j]
+          (-1 if unreachable)
+        - The node list giving the row/column order
+    """
+    nodes = list(G.nodes())
+    n = len(nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    m = G.number_of_edges()
+    src = np.fromiter((index[u] for u, _ in G.edges()), dtype=np.int32, count=m)
+    dst = np.fromiter((index[v] for _, v in G.edges()), dtype=np.int32, count=m)
+    
+    # Chess graphs have at most 64 nodes, so a dense float32 adjacency matrix
+    # (multiplied through BLAS) beats a sparse one
+    A = np.zeros((n, n), dtype=np.float32)
+    A[src, dst] = 1.0
+    # frontier @ A advances along edges; frontier @ A.T goes against them
+    step = A.T if reverse else A
+    
+    dist = np.full((n, n), -1, dtype=np.int32)
+    np.fill_diagonal(dist, 0)
+    reached = np.eye(n, dtype=bool)
+    frontier = reached
+    level = 0
+    # Only frontier nodes with an edge to follow can reach anything new; once there
+    # are none left the search is over, without another (empty) matrix product
+    expandable = step.any(axis=1)
+    while (frontier & expandable).any() and (cutoff is None or level < cutoff):
+        level += 1
+        frontier = ((frontier.astype(np.float32) @ step) > 0) & ~reached
+        dist[frontier] = level
+        reached |= frontier
+    
+    return dist, nodes
+
+
 def compute_directed_out_diameter(G: nx.DiGraph) -> int:
     """
     Compute the directed out-diameter of a graph.
@@ -144,13 +269,9 @@ def compute_directed_out_diameter(G: nx.DiGraph) -> int:
     if G.number_of_nodes() <= 1:
         return 0
     
-    max_distance = 0
-    for u in G.nodes():
-        lengths = dict(nx.single_source_shortest_path_length(G, u))
-        if lengths:
-            max_distance = max(max_distance, max(lengths.values()))
-    
-    return max_distance
+    # Only the maximum is needed, so no node pairs are collected
+    dist, _ = compute_distance_matrix(G)
+    return int(dist.max())
 
 
 def compute_directed_in_diameter(G: nx.DiGraph) -> int:
@@ -169,13 +290,38 @@ def compute_directed_in_diameter(G: nx.DiGraph) -> int:
     if G.number_of_nodes() <= 1:
         return 0
     
-    max_distance = 0
-    for v in G.nodes():
-        lengths = dict(nx.single_target_shortest_path_length(G, v))
-        if lengths:
-            max_distance = max(max_distance, max(lengths.values()))
+    # The reversed distance matrix is the transpose of the forward one, so it has
+    # the same maximum; only the node pairs differ (see the details variant)
+    dist, _ = compute_distance_matrix(G)
+    return int(dist.max())
+
+
+def _diameter_pairs(
+    dist: np.ndarray, 
+    nodes: List[Any]
+) -> Tuple[int, List[Tuple[Any, Any]], List[Tuple[Any, Any]]]:
+    """
+    Read the diameter and the node pairs at that distance off a distance matrix.
+    
+    The distance from u to v against edge directions is the distance from v to u
+    along them, so the in-diameter equals the out-diameter and is reached by the
+    same pairs; only their order differs.
     
-    return max_distance
+    Args:
+        dist: Distance matrix as returned by compute_distance_matrix
+        nodes: The node list giving the row/column order of dist
+        
+    Returns:
+        Tuple containing:
+        - The diameter as an integer
+        - The pairs (u, v), ordered by source, then target, in node order
+        - The same pairs ordered by target, then source, in node order
+    """
+    diameter = int(dist.max())
+    sources, targets = np.nonzero(dist == diameter)
+    out_pairs = [(nodes[i], nodes[j]) for i, j in zip(sources, targets)]
+    in_pairs = [out_pairs[k] for k in np.lexsort((sources, targets))]
+    return diameter, out_pairs, in_pairs
 
 
 def compute_directed_out_diameter_details(G: nx.DiGraph) -> Tuple[int, List[Tuple[Any, Any]]]:
@@ -190,23 +336,7 @@ def compute_directed_out_diameter_details(G: nx.DiGraph) -> Tuple[int, List[Tupl
         - The out-diameter (maximum shortest path length) as an integer
         - A list of node pairs (u, v) with shortest path length equal to the diameter
     """
-    if G.number_of_nodes() <= 1:
-        return 0, []
-    
-    max_distance = 0
-    for u in G.nodes():
-        lengths = dict(nx.single_source_shortest_path_length(G, u))
-        if lengths:
-            max_distance = max(max_distance, max(lengths.values()))
-    
-    pairs = []
-    for u in G.nodes():
-        lengths = dict(nx.single_source_shortest_path_length(G, u))
-        for v, d in lengths.items():
-            if d == max_distance:
-                pairs.append((u, v))
-    
-    return max_distance, pairs
+    return compute_directed_diameter_details(G)[0]
 
 
 def compute_directed_in_diameter_details(G: nx.DiGraph) -> Tuple[int, List[Tuple[Any, Any]]]:
@@ -221,104 +351,170 @@ def compute_directed_in_diameter_details(G: nx.DiGraph) -> Tuple[int, List[Tuple
         - The in-diameter (maximum shortest path length) as an integer
         - A list of node pairs (u, v) with shortest path length equal to the diameter
     """
-    if G.number_of_nodes() <= 1:
-        return 0, []
+    return compute_directed_diameter_details(G)[1]
+
+
+def compute_directed_diameter_details(
+    G: nx.DiGraph
+) -> Tuple[Tuple[int, List[Tuple[Any, Any]]], Tuple[int, List[Tuple[Any, Any]]]]:
+    """
+    Compute the directed out- and in-diameter details from a single distance matrix.
     
-    max_distance = 0
-    for v in G.nodes():
-        lengths = dict(nx.single_target_shortest_path_length(G, v))
-        if lengths:
-            max_distance = max(max_distance, max(lengths.values()))
+    Only the forward distance matrix is computed; the reversed one would be its
+    transpose (see _diameter_pairs).
     
-    pairs = []
-    for v in G.nodes():
-        lengths = dict(nx.single_target_shortest_path_length(G, v))
-        for u, d in lengths.items():
-            if d == max_distance:
-                pairs.append((u, v))
+    Args:
+        G: The directed graph
+        
+    Returns:
+        Tuple containing:
+        - The result of compute_directed_out_diameter_details
+        - The result of compute_directed_in_diameter_details
+    """
+    if G.number_of_nodes() <= 1:
+        return (0, []), (0, [])
     
-    return max_distance, pairs
+    dist, nodes = compute_distance_matrix(G)
+    diameter, out_pairs, in_pairs = _diameter_pairs(dist, nodes)
+    return (diameter, out_pairs), (diameter, in_pairs)
 
 
-def aggregate_directed_out_diameter(components: List[nx.DiGraph], exponent: float = 2) -> float:
+def aggregate_directed_out_diameter(
+    components: List[nx.DiGraph], 
+    exponent: float = 2,
+    values: Optional[List[int]] = None,
+    weights: Optional[np.ndarray] = None
+) -> float:
     """
     Aggregate out-diameter values across components using power-law weighting.
     
     Args:
         components: List of component subgraphs
         exponent: Power-law exponent for weighting (larger components have more influence)
+        values: Optional precomputed per-component out-diameters (same order as components);
+            when given, they are used instead of recomputing them
+        weights: Optional precomputed weights from compute_component_weights;
+            when given, exponent is ignored
         
     Returns:
         Weighted average of out-diameter values across components
     """
-    total_weight = sum(comp.number_of_nodes() ** exponent for comp in components)
-    aggregated_value = 0.0
-    
-    for comp in components:
-        weight = comp.number_of_nodes() ** exponent
-        out_diam = compute_directed_out_diameter(comp)
-        aggregated_value += (weight / total_weight) * out_diam
+    if weights is None:
+        weights = compute_component_weights(components, exponent)
+    if values is None:
+        values = [compute_directed_out_diameter(comp) for comp in components]
     
-    return aggregated_value
+    return float(weights @ np.asarray(values, dtype=np.float64))
 
 
-def aggregate_directed_in_diameter(components: List[nx.DiGraph], exponent: float = 2) -> float:
+def aggregate_directed_in_diameter(
+    components: List[nx.DiGraph], 
+    exponent: float = 2,
+    values: Optional[List[int]] = None,
+    weights: Optional[np.ndarray] = None
+) -> float:
     """
     Aggregate in-diameter values across components using power-law weighting.
     
     Args:
         components: List of component subgraphs
         exponent: Power-law exponent for weighting (larger components have more influence)
+        values: Optional precomputed per-component in-diameters (same order as components);
+            when given, they are used instead of recomputing them
+        weights: Optional precomputed weights from compute_component_weights;
+            when given, exponent is ignored
         
     Returns:
         Weighted average of in-diameter values across components
     """
-    total_weight = sum(comp.number_of_nodes() ** exponent for comp in components)
-    aggregated_value = 0.0
-    
-    for comp in components:
-        weight = comp.number_of_nodes() ** exponent
-        in_diam = compute_directed_in_diameter(comp)
-        aggregated_value += (weight / total_weight) * in_diam
+    if weights is None:
+        weights = compute_component_weights(components, exponent)
+    if values is None:
+        values = [compute_directed_in_diameter(comp) for comp in components]
     
-    return aggregated_value
+    return float(weights @ np.asarray(values, dtype=np.float64))
 
 
 # --- Centrality Analysis Functions ---
 
-def compute_in_degree_centrality_metrics(G: nx.DiGraph) -> Dict[str, Any]:
+def _centrality_summary(nodes: List[Any], centrality: np.ndarray) -> Dict[str, Any]:
     """
-    Compute in-degree centrality metrics for a graph.
+    Package per-node centrality values with their average and variance.
     
     Args:
-        G: The directed graph
+        nodes: Node IDs, in the same order as centrality
+        centrality: Array of centrality values
         
     Returns:
-        Dictionary containing:
-        - node_centralities: Dict mapping node IDs to centrality values
-        - average: Average centrality across all nodes
-        - variance: Variance of centrality values
-        - component_size: Number of nodes in the graph
+        Dictionary in the format of compute_in_degree_centrality_metrics
     """
-    centrality = nx.in_degree_centrality(G)
-    values = list(centrality.values())
-    n = len(values)
+    n = len(nodes)
     
     if n > 0:
-        avg = sum(values) / n
-        var = sum((x - avg) ** 2 for x in values) / n
+        avg = float(centrality.mean())
+        var = float(centrality.var())
     else:
         avg = 0
         var = 0
     
     return {
-        "node_centralities": centrality,
+        "node_centralities": dict(zip(nodes, centrality.tolist())),
         "average": avg,
         "variance": var,
-        "component_size": G.number_of_nodes()
+        "component_size": n
     }
 
 
+def compute_degree_centrality_metrics(G: nx.DiGraph) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Compute in- and out-degree centrality metrics for a graph together.
+    
+    Both degree sequences come from one pass over the edge list (np.bincount over
+    the edge endpoints), normalized by n - 1 like nx.in/out_degree_centrality.
+    
+    Args:
+        G: The directed graph
+        
+    Returns:
+        Tuple containing:
+        - In-degree centrality metrics (see compute_in_degree_centrality_metrics)
+        - Out-degree centrality metrics (see compute_out_degree_centrality_metrics)
+    """
+    nodes = list(G.nodes())
+    n = len(nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    m = G.number_of_edges()
+    src = np.fromiter((index[u] for u, _ in G.edges()), dtype=np.int32, count=m)
+    dst = np.fromiter((index[v] for _, v in G.edges()), dtype=np.int32, count=m)
+    
+    if n <= 1:
+        # networkx's convention for graphs with fewer than two nodes
+        in_centrality = out_centrality = np.ones(n)
+    else:
+        scale = 1 / (n - 1)
+        in_centrality = np.bincount(dst, minlength=n) * scale
+        out_centrality = np.bincount(src, minlength=n) * scale
+    
+    return _centrality_summary(nodes, in_centrality), _centrality_summary(nodes, out_centrality)
+
+
+def compute_in_degree_centrality_metrics(G: nx.DiGraph) -> Dict[str, Any]:
+    """
+    Compute in-degree centrality metrics for a graph.
+    
+    Args:
+        G: The directed graph
+        
+    Returns:
+        Dictionary containing:
+        - node_centralities: Dict mapping node IDs to centrality values
+        - average: Average centrality across all nodes
+        - variance: Variance of centrality values
+        - component_size: Number of nodes in the graph
+    """
+    return compute_degree_centrality_metrics(G)[0]
+
+
 def compute_out_degree_centrality_metrics(G: nx.DiGraph) -> Dict[str, Any]:
     """
     Compute out-degree centrality metrics for a graph.
@@ -333,28 +529,14 @@ def compute_out_degree_centrality_metrics(G: nx.DiGraph) -> Dict[str, Any]:
         - variance: Variance of centrality values
         - component_size: Number of nodes in the graph
     """
-    centrality = nx.out_degree_centrality(G)
-    values = list(centrality.values())
-    n = len(values)
-    
-    if n > 0:
-        avg = sum(values) / n
-        var = sum((x - avg) ** 2 for x in values) / n
-    else:
-        avg = 0
-        var = 0
-    
-    return {
-        "node_centralities": centrality,
-        "average": avg,
-        "variance": var,
-        "component_size": G.number_of_nodes()
-    }
+    return compute_degree_centrality_metrics(G)[1]
 
 
 def aggregate_in_degree_centrality_metrics(
     components: List[nx.DiGraph], 
-    exponent: float = 2
+    exponent: float = 2,
+    values: Optional[List[Dict[str, Any]]] = None,
+    weights: Optional[np.ndarray] = None
 ) -> Tuple[float, float, List[Dict[str, Any]]]:
     """
     Aggregate in-degree centrality metrics across components.
@@ -362,6 +544,10 @@ def aggregate_in_degree_centrality_metrics(
     Args:
         components: List of component subgraphs
         exponent: Power-law exponent for weighting (larger components have more influence)
+        values: Optional precomputed per-component in-degree metrics (same order as components);
+            when given, they are used instead of recomputing them
+        weights: Optional precomputed weights from compute_component_weights;
+            when given, exponent is ignored
         
     Returns:
         Tuple containing:
@@ -369,24 +555,22 @@ def aggregate_in_degree_centrality_metrics(
         - Weighted variance of in-degree centrality
         - List of component-specific metrics
     """
-    total_weight = sum(comp.number_of_nodes() ** exponent for comp in components)
-    aggregated_avg = 0.0
-    aggregated_var = 0.0
-    comp_details = []
-    
-    for comp in components:
-        metrics = compute_in_degree_centrality_metrics(comp)
-        weight = comp.number_of_nodes() ** exponent
-        aggregated_avg += (weight / total_weight) * metrics["average"]
-        aggregated_var += (weight / total_weight) * metrics["variance"]
-        comp_details.append(metrics)
-    
-    return aggregated_avg, aggregated_var, comp_details
+    if weights is None:
+        weights = compute_component_weights(components, exponent)
+    if values is None:
+        values = [compute_in_degree_centrality_metrics(comp) for comp in components]
+    comp_details = list(values)
+    
+    averages = np.array([metrics["average"] for metrics in comp_details], dtype=np.float64)
+    variances = np.array([metrics["variance"] for metrics in comp_details], dtype=np.float64)
+    return float(weights @ averages), float(weights @ variances), comp_details
 
 
 def aggregate_out_degree_centrality_metrics(
     components: List[nx.DiGraph], 
-    exponent: float = 2
+    exponent: float = 2,
+    values: Optional[List[Dict[str, Any]]] = None,
+    weights: Optional[np.ndarray] = None
 ) -> Tuple[float, float, List[Dict[str, Any]]]:
     """
     Aggregate out-degree centrality metrics across components.
@@ -394,6 +578,10 @@ def aggregate_out_degree_centrality_metrics(
     Args:
         components: List of component subgraphs
         exponent: Power-law exponent for weighting (larger components have more influence)
+        values: Optional precomputed per-component out-degree metrics (same order as components);
+            when given, they are used instead of recomputing them
+        weights: Optional precomputed weights from compute_component_weights;
+            when given, exponent is ignored
         
     Returns:
         Tuple containing:
@@ -401,29 +589,30 @@ def aggregate_out_degree_centrality_metrics(
         - Weighted variance of out-degree centrality
         - List of component-specific metrics
     """
-    total_weight = sum(comp.number_of_nodes() ** exponent for comp in components)
-    aggregated_avg = 0.0
-    aggregated_var = 0.0
-    comp_details = []
-    
-    for comp in components:
-        metrics = compute_out_degree_centrality_metrics(comp)
-        weight = comp.number_of_nodes() ** exponent
-        aggregated_avg += (weight / total_weight) * metrics["average"]
-        aggregated_var += (weight / total_weight) * metrics["variance"]
-        comp_details.append(metrics)
-    
-    return aggregated_avg, aggregated_var, comp_details
+    if weights is None:
+        weights = compute_component_weights(components, exponent)
+    if values is None:
+        values = [compute_out_degree_centrality_metrics(comp) for comp in components]
+    comp_details = list(values)
+    
+    averages = np.array([metrics["average"] for metrics in comp_details], dtype=np.float64)
+    variances = np.array([metrics["variance"] for metrics in comp_details], dtype=np.float64)
+    return float(weights @ averages), float(weights @ variances), comp_details
 
 
 # --- Modularity and Community Detection Functions ---
 
-def compute_directed_modularity(G: nx.DiGraph) -> Tuple[float, List[Set[Any]]]:
+def compute_directed_modularity(
+    G: nx.DiGraph, 
+    cache: Optional[Dict[Any, Tuple[float, List[Set[Any]]]]] = None
+) -> Tuple[float, List[Set[Any]]]:
     """
     Compute a quality measure for directed graph G using leiden and the coverage evaluation.
     
     Args:
         G: The directed graph
+        cache: Optional dictionary of earlier results keyed by the graph's node and edge
+            sets; a graph with the same structure reuses the stored result
         
     Returns:
         Tuple containing:
@@ -433,20 +622,50 @@ def compute_directed_modularity(G: nx.DiGraph) -> Tuple[float, List[Set[Any]]]:
     if G.number_of_nodes() < 2:
         return 0, []
     
-    H = nx.convert_node_labels_to_integers(G, label_attribute="orig_label")
-    communities_result = algorithms.leiden(H)
-    communities_orig = [set(H.nodes[n]["orig_label"] for n in community)
-                        for community in communities_result.communities]
-    
-    cov = evaluation.conductance(H, communities_result)
-    # If cov is a list or tuple, take the average
-    if isinstance(cov, (list, tuple)):
-        cov = np.mean(cov)
+    if cache is not None:
+        key = (frozenset(G.nodes()), frozenset(G.edges()))
+        if key in cache:
+            return cache[key]
+        result = compute_directed_modularity(G)
+        cache[key] = result
+        return result
+    
+    nodes = list(G.nodes())
+    if G.number_of_edges() == 0:
+        # Without edges every node is its own community and nothing is cut
+        return 0.0, [{node} for node in nodes]
+    
+    n = len(nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = np.array([(index[u], index[v]) for u, v in G.edges()], dtype=np.int64).reshape(-1, 2)
+    
+    # Build the igraph graph once and run leidenalg on it directly (same
+    # partition type cdlib's leiden uses)
+    H = ig.Graph(n=n, edges=edges.tolist(), directed=True)
+    partition = leidenalg.find_partition(H, leidenalg.RBConfigurationVertexPartition)
+    communities_orig = [set(nodes[i] for i in community) for community in partition]
+    if len(communities_orig) == 1:
+        # Every edge is internal to the single community, so all conductances are 0
+        return 0.0, communities_orig
+    
+    # Conductance per community: an edge whose endpoints share a community is
+    # internal to it, otherwise it is a cut edge of its source's community
+    membership = np.asarray(partition.membership)
+    src_comm = membership[edges[:, 0]]
+    internal = src_comm == membership[edges[:, 1]]
+    n_comms = len(partition)
+    ms = np.bincount(src_comm[internal], minlength=n_comms)
+    edges_outside = np.bincount(src_comm[~internal], minlength=n_comms)
+    denom = 2 * ms + edges_outside
+    ratios = np.divide(edges_outside, denom, out=np.zeros(n_comms), where=denom > 0)
+    
+    # Average of the (min, max, mean, std) conductance summary
+    cov = np.mean([ratios.min(), ratios.max(), ratios.mean(), ratios.std()])
     
     return cov, communities_orig
 
 
-def compute_weighted_directed_clustering(G: nx.DiGraph) -> float:
+def compute_weighted_directed_clustering(G: nx.DiGraph, UG: Optional[nx.Graph] = None) -> float:
     """
     Compute the average size of the largest maximal clique each node belongs to.
     
@@ -455,22 +674,19 @@ def compute_weighted_directed_clustering(G: nx.DiGraph) -> float:
     
     Args:
         G: The directed graph
+        UG: Optional undirected version of G (e.g. G.to_undirected(as_view=True));
+            when given, it is used instead of converting G again
         
     Returns:
         Average size of the largest maximal clique per node
     """
-    # Convert directed graph to undirected version
-    UG = G.to_undirected()
-    
-    cliques = list(nx.find_cliques(UG))
-    # Create a dictionary to store the maximum clique size per node
-    max_clique_size = {node: 0 for node in UG.nodes()}
+    # Undirected view of the directed graph; cheaper than building a copy
+    if UG is None:
+        UG = G.to_undirected(as_view=True)
     
-    for clique in cliques:
-        clique_size = len(clique)
-        for node in clique:
-            if clique_size > max_clique_size[node]:
-                max_clique_size[node] = clique_size
+    # Largest maximal clique size per node; the cliques are streamed from the
+    # generator rather than materialized as a list first
+    max_clique_size = nx.node_clique_number(UG, cliques=nx.find_cliques(UG))
     
     if len(max_clique_size) == 0:
         return 0.0
@@ -480,7 +696,9 @@ def compute_weighted_directed_clustering(G: nx.DiGraph) -> float:
 
 def aggregate_directed_modularity(
     components: List[nx.DiGraph], 
-    exponent: float = 2
+    exponent: float = 2,
+    values: Optional[List[Tuple[float, List[Set[Any]]]]] = None,
+    weights: Optional[np.ndarray] = None
 ) -> Tuple[float, List[Tuple[float, List[Set[Any]]]]]:
     """
     Aggregate directed modularity values across components using power-law weighting.
@@ -488,33 +706,40 @@ def aggregate_directed_modularity(
     Args:
         components: List of component subgraphs
         exponent: Power-law exponent for weighting (larger components have more influence)
+        values: Optional precomputed per-component (modularity_value, communities) pairs (same order as components);
+            when given, they are used instead of recomputing them
+        weights: Optional precomputed weights from compute_component_weights;
+            when given, exponent is ignored
         
     Returns:
         Tuple containing:
         - Weighted average of modularity values
         - List of (modularity_value, communities) pairs for each component
     """
-    total_weight = sum(comp.number_of_nodes() ** exponent for comp in components)
-    aggregated_value = 0.0
+    if weights is None:
+        weights = compute_component_weights(components, exponent)
     mod_values = []
     
-    for comp in components:
+    for idx, comp in enumerate(components):
         if comp.number_of_nodes() < 2:
             mod_val = 0
             communities = []
+        elif values is not None:
+            mod_val, communities = values[idx]
         else:
             mod_val, communities = compute_directed_modularity(comp)
         
         mod_values.append((mod_val, communities))
-        weight = comp.number_of_nodes() ** exponent
-        aggregated_value += (weight / total_weight) * mod_val
     
-    return aggregated_value, mod_values
+    mods = np.array([mod_val for mod_val, _ in mod_values], dtype=np.float64)
+    return float(weights @ mods), mod_values
 
 
 def aggregate_weighted_directed_clustering(
     components: List[nx.DiGraph], 
-    exponent: float = 2
+    exponent: float = 2,
+    values: Optional[List[float]] = None,
+    weights: Optional[np.ndarray] = None
 ) -> Tuple[float, List[float]]:
     """
     Aggregate clustering coefficients across components using power-law weighting.
@@ -522,27 +747,31 @@ def aggregate_weighted_directed_clustering(
     Args:
         components: List of component subgraphs
         exponent: Power-law exponent for weighting (larger components have more influence)
+        values: Optional precomputed per-component clustering coefficients (same order as components);
+            when given, they are used instead of recomputing them
+        weights: Optional precomputed weights from compute_component_weights;
+            when given, exponent is ignored
         
     Returns:
         Tuple containing:
         - Weighted average of clustering coefficients
         - List of clustering coefficients for each component
     """
-    total_weight = sum(comp.number_of_nodes() ** exponent for comp in components)
-    aggregated_value = 0.0
+    if weights is None:
+        weights = compute_component_weights(components, exponent)
     clust_values = []
     
-    for comp in components:
+    for idx, comp in enumerate(components):
         if comp.number_of_nodes() < 2:
             cc = 0
+        elif values is not None:
+            cc = values[idx]
         else:
             cc = compute_weighted_directed_clustering(comp)
         
         clust_values.append(cc)
-        weight = comp.number_of_nodes() ** exponent
-        aggregated_value += (weight / total_weight) * cc
     
-    return aggregated_value, clust_values
+    return float(weights @ np.asarray(clust_values, dtype=np.float64)), clust_values
 
 
 # --- Entropy Functions ---
@@ -564,65 +793,160 @@ def compute_size_entropy(components: List[nx.DiGraph]) -> Tuple[float, Dict[str,
         - Aggregated entropy value (sum of all component entropies)
         - Dictionary mapping component IDs to their entropy values
     """
-    total_nodes = sum(comp.number_of_nodes() for comp in components)
-    entropy_dict = {}
-    aggregated_entropy = 0.0
+    sizes = np.fromiter((comp.number_of_nodes() for comp in components),
+                        dtype=np.int64, count=len(components))
+    total_nodes = sizes.sum()
+    p = sizes / total_nodes if total_nodes > 0 else np.zeros(len(sizes))
+    # Compute entropy with a minus sign. Only compute log where p > 0.
+    entropies = -p * np.log(p, out=np.zeros_like(p), where=p > 0)
     
-    for idx, comp in enumerate(components):
-        size = comp.number_of_nodes()
-        p = size / total_nodes if total_nodes > 0 else 0
-        # Compute entropy with a minus sign. Only compute log if p > 0.
-        entropy = -p * math.log(p) if p > 0 else 0
-        entropy_dict[f"Component {idx+1} (size {size})"] = entropy
-        aggregated_entropy += entropy
+    entropy_dict = {f"Component {idx+1} (size {size})": entropy
+                    for idx, (size, entropy) in enumerate(zip(sizes.tolist(), entropies.tolist()))}
     
-    return aggregated_entropy, entropy_dict
+    return float(entropies.sum()), entropy_dict
 
 
 # --- Full Graph Analysis Functions ---
 
-def analyze_chess_graph(G: nx.DiGraph, name: str = "Graph") -> Dict[str, Any]:
+def _analyze_component(
+    comp: nx.DiGraph, 
+    leiden_cache: Optional[Dict[Any, Tuple[float, List[Set[Any]]]]] = None
+) -> Tuple[Any, ...]:
+    """
+    Compute all per-component metrics used by analyze_chess_graph.
+    
+    Kept at module level so it can be shipped to worker processes.
+    
+    Args:
+        comp: The component subgraph
+        leiden_cache: Optional community detection cache (see compute_directed_modularity)
+        
+    Returns:
+        Tuple of (fiedler, out_diameter, out_paths, in_diameter, in_paths, modularity,
+        communities, clustering, in_degree_metrics, out_degree_metrics)
+    """
+    # Fiedler value
+    fiedler_val = compute_fiedler_value(comp)
+    
+    # Diameter metrics, both directions from one distance matrix
+    (out_diam, out_paths), (in_diam, in_paths) = compute_directed_diameter_details(comp)
+    
+    # Modularity
+    mod_val, communities = compute_directed_modularity(comp, leiden_cache)
+    
+    # Clustering, on an undirected view of the component
+    ug = comp.to_undirected(as_view=True)
+    clust_val = compute_weighted_directed_clustering(comp, ug)
+    
+    # In- and out-degree centrality in one pass
+    in_metrics, out_metrics = compute_degree_centrality_metrics(comp)
+    
+    return (fiedler_val, out_diam, out_paths, in_diam, in_paths, mod_val, communities,
+            clust_val, in_metrics, out_metrics)
+
+
+def _analyze_singleton(comp: nx.DiGraph) -> Tuple[Any, ...]:
+    """
+    Return the per-component metrics of a single-node component without computing them.
+    
+    Matches what _analyze_component returns for such a component: no Fiedler value,
+    zero diameters, no communities, a largest clique of size 1 and a degree centrality
+    of 1 (networkx's convention for single-node graphs).
+    
+    Args:
+        comp: A component subgraph with one node
+        
+    Returns:
+        Tuple in the format of _analyze_component
+    """
+    nodes = list(comp.nodes())
+    centrality = _centrality_summary(nodes, np.ones(len(nodes)))
+    return (None, 0, [], 0, [], 0, [], 1.0, centrality, dict(centrality))
+
+
+def analyze_chess_graph(
+    G: nx.DiGraph, 
+    name: str = "Graph", 
+    max_workers: Optional[int] = 1,
+    leiden_cache: Optional[Dict[Any, Tuple[float, List[Set[Any]]]]] = None,
+    verbose: bool = False
+) -> Dict[str, Any]:
     """
     Perform a comprehensive analysis of a chess influence graph.
     
     Args:
         G: The directed graph to analyze
         name: Name identifier for the graph (e.g., "White", "Black", "Combined")
+        max_workers: Number of processes used to analyze the components. The default of 1
+            analyzes them sequentially, which is fastest for typical positions where the
+            per-component work is small; None uses one process per CPU.
+        leiden_cache: Optional community detection cache shared between calls, so that a
+            component appearing in several graphs of a position is partitioned once
+            (see compute_directed_modularity); not used by worker processes
+        verbose: If True, log per-component and aggregated metrics at INFO level
         
     Returns:
         Dictionary with all computed metrics
     """
-    print(f"\n{name} Influence Graph Analysis:")
+    # Components are produced lazily as views of G. Each one is copied only for its
+    # own analysis (or its submission to a worker), so the component copies are not
+    # all held at once; the views kept for the aggregates only reference G.
+    components = []
+    sizes = []
+    node_to_component = {}
+    analyses = []
+    pool = ProcessPoolExecutor(max_workers=max_workers) if max_workers != 1 else nullcontext()
+    with pool as executor:
+        for idx, comp in enumerate(iter_components(G, component_type='weak')):
+            component_size = comp.number_of_nodes()
+            node_to_component.update(dict.fromkeys(comp, idx))
+            components.append(comp)
+            sizes.append(component_size)
+            
+            # Single-node components (isolated pieces) have constant metrics, so only
+            # the larger ones go through the full analysis
+            if component_size < 2:
+                analyses.append(_analyze_singleton(comp))
+            elif executor is None:
+                analyses.append(_analyze_component(comp.copy(), leiden_cache))
+            else:
+                analyses.append(executor.submit(_analyze_component, comp.copy()))
+        
+        if executor is not None:
+            analyses = [a if isinstance(a, tuple) else a.result() for a in analyses]
     
-    # Decompose into components
-    components = decompose_into_components(G, component_type='weak')
-    print(f"  Number of disconnected components: {len(components)}")
+    if verbose:
+        logger.info(f"\n{name} Influence Graph Analysis:")
+        logger.info(f"  Number of disconnected components: {len(components)}")
     
     # Verify components
-    if verify_no_intercomponent_edges(G, components):
-        print("  Verified: No inter-component edges.")
+    if verify_no_intercomponent_edges(G, components, node_to_component):
+        if verbose:
+            logger.info("  Verified: No inter-component edges.")
     else:
-        print("  Error: Inter-component edges detected.")
+        logger.error(f"{name}: inter-component edges detected.")
     
-    # Analyze components
+    # Collect the per-component values so the aggregates below reuse them instead
+    # of recomputing every metric
     component_metrics = []
-    for idx, comp in enumerate(components):
-        component_size = comp.number_of_nodes()
-        
-        # Fiedler value
-        fiedler_val = compute_fiedler_value(comp)
-        
-        # Diameter metrics
-        out_diam = compute_directed_out_diameter(comp)
-        in_diam = compute_directed_in_diameter(comp)
-        out_diam_details, out_paths = compute_directed_out_diameter_details(comp)
-        in_diam_details, in_paths = compute_directed_in_diameter_details(comp)
-        
-        # Modularity
-        mod_val, communities = compute_directed_modularity(comp)
+    fiedler_values = []
+    out_diameters = []
+    in_diameters = []
+    mod_results = []
+    clust_values = []
+    in_degree_metrics = []
+    out_degree_metrics = []
+    for idx, (comp, component_size, analysis) in enumerate(zip(components, sizes, analyses)):
+        (fiedler_val, out_diam, out_paths, in_diam, in_paths, mod_val, communities,
+         clust_val, in_metrics, out_metrics) = analysis
         
-        # Clustering
-        clust_val = compute_weighted_directed_clustering(comp)
+        fiedler_values.append(fiedler_val)
+        out_diameters.append(out_diam)
+        in_diameters.append(in_diam)
+        mod_results.append((mod_val, communities))
+        clust_values.append(clust_val)
+        in_degree_metrics.append(in_metrics)
+        out_degree_metrics.append(out_metrics)
         
         # Store component metrics
         component_metrics.append({
@@ -640,23 +964,27 @@ def analyze_chess_graph(G: nx.DiGraph, name: str = "Graph") -> Dict[str, Any]:
             "nodes": list(comp.nodes())
         })
         
-        # Print component details
-        print(f"\n  Component {idx+1} (size {component_size}):")
-        print(f"    Fiedler Value = {fiedler_val}")
-        print(f"    Directed Out-Diameter = {out_diam}, Node pairs = {out_paths[:3]}...")
-        print(f"    Directed In-Diameter = {in_diam}, Node pairs = {in_paths[:3]}...")
-        print(f"    Modularity = {mod_val}")
-        print(f"    Number of communities = {len(communities)}")
-        print(f"    Clustering Coefficient = {clust_val}")
-    
-    # Compute aggregated metrics
-    agg_fiedler = aggregate_fiedler_value_power(components)
-    agg_out_diam = aggregate_directed_out_diameter(components)
-    agg_in_diam = aggregate_directed_in_diameter(components)
+        # Log component details
+        if verbose:
+            logger.info(f"\n  Component {idx+1} (size {component_size}):")
+            logger.info(f"    Fiedler Value = {fiedler_val}")
+            logger.info(f"    Directed Out-Diameter = {out_diam}, Node pairs = {out_paths[:3]}...")
+            logger.info(f"    Directed In-Diameter = {in_diam}, Node pairs = {in_paths[:3]}...")
+            logger.info(f"    Modularity = {mod_val}")
+            logger.info(f"    Number of communities = {len(communities)}")
+            logger.info(f"    Clustering Coefficient = {clust_val}")
+    
+    # Compute aggregated metrics (the power-law weights are shared by all aggregates)
+    weights = compute_component_weights(components, sizes=sizes)
+    agg_fiedler = aggregate_fiedler_value_power(components, values=fiedler_values, weights=weights)
+    agg_out_diam = aggregate_directed_out_diameter(components, values=out_diameters, weights=weights)
+    agg_in_diam = aggregate_directed_in_diameter(components, values=in_diameters, weights=weights)
     
     # Compute centrality metrics
-    agg_in_avg, agg_in_var, in_details = aggregate_in_degree_centrality_metrics(components)
-    agg_out_avg, agg_out_var, out_details = aggregate_out_degree_centrality_metrics(components)
+    agg_in_avg, agg_in_var, in_details = aggregate_in_degree_centrality_metrics(
+        components, values=in_degree_metrics, weights=weights)
+    agg_out_avg, agg_out_var, out_details = aggregate_out_degree_centrality_metrics(
+        components, values=out_degree_metrics, weights=weights)
     
     # All node centralities
     in_centrality = {}
@@ -667,8 +995,8 @@ def analyze_chess_graph(G: nx.DiGraph, name: str = "Graph") -> Dict[str, Any]:
         out_centrality.update(detail["node_centralities"])
     
     # Compute modularity and clustering
-    agg_mod, mod_info = aggregate_directed_modularity(components)
-    agg_clust, clust_vals = aggregate_weighted_directed_clustering(components)
+    agg_mod, mod_info = aggregate_directed_modularity(components, values=mod_results, weights=weights)
+    agg_clust, clust_vals = aggregate_weighted_directed_clustering(components, values=clust_values, weights=weights)
     
     # Get all communities
     all_communities = []
@@ -710,29 +1038,31 @@ def analyze_chess_graph(G: nx.DiGraph, name: str = "Graph") -> Dict[str, Any]:
         "entropy_details": entropy_details
     }
     
-    # Print aggregated results
-    print("\n  Aggregated metrics:")
-    print(f"    Fiedler Value: {agg_fiedler}")
-    print(f"    Out-Diameter: {agg_out_diam}")
-    print(f"    In-Diameter: {agg_in_diam}")
-    print(f"    In-Degree Centrality: avg={agg_in_avg}, var={agg_in_var}")
-    print(f"    Out-Degree Centrality: avg={agg_out_avg}, var={agg_out_var}")
-    print(f"    Modularity: {agg_mod}")
-    print(f"    Communities: {len(all_communities)}")
-    print(f"    Clustering: {agg_clust}")
-    print(f"    Size Entropy: {entropy}")
+    # Log aggregated results
+    if verbose:
+        logger.info("\n  Aggregated metrics:")
+        logger.info(f"    Fiedler Value: {agg_fiedler}")
+        logger.info(f"    Out-Diameter: {agg_out_diam}")
+        logger.info(f"    In-Diameter: {agg_in_diam}")
+        logger.info(f"    In-Degree Centrality: avg={agg_in_avg}, var={agg_in_var}")
+        logger.info(f"    Out-Degree Centrality: avg={agg_out_avg}, var={agg_out_var}")
+        logger.info(f"    Modularity: {agg_mod}")
+        logger.info(f"    Communities: {len(all_communities)}")
+        logger.info(f"    Clustering: {agg_clust}")
+        logger.info(f"    Size Entropy: {entropy}")
     
     return results
 
 
 # --- Main Execution ---
 
-def analyze_position(fen: str) -> Dict[str, Dict[str, Any]]:
+def analyze_position(fen: str, verbose: bool = False) -> Dict[str, Dict[str, Any]]:
     """
     Analyze a chess position and compute metrics for all graph types.
     
     Args:
         fen: The FEN string representing the chess position
+        verbose: If True, log the metrics of each graph (see analyze_chess_graph)
         
     Returns:
         Dictionary with analysis results for combined, white, and black graphs
@@ -746,10 +1076,13 @@ def analyze_position(fen: str) -> Dict[str, Dict[str, Any]]:
     white_graph = pos_graph.compute_influence_subgraph_by_color(chess.WHITE)
     black_graph = pos_graph.compute_influence_subgraph_by_color(chess.BLACK)
     
-    # Analyze each graph type
-    combined_metrics = analyze_chess_graph(combined_graph, "Combined")
-    white_metrics = analyze_chess_graph(white_graph, "White")
-    black_metrics = analyze_chess_graph(black_graph, "Black")
+    # Analyze each graph type. A combined component made of one color's pieces
+    # reappears unchanged in that color's graph, so community detection results
+    # are shared between the three analyses.
+    leiden_cache = {}
+    combined_metrics = analyze_chess_graph(combined_graph, "Combined", leiden_cache=leiden_cache, verbose=verbose)
+    white_metrics = analyze_chess_graph(white_graph, "White", leiden_cache=leiden_cache, verbose=verbose)
+    black_metrics = analyze_chess_graph(black_graph, "Black", leiden_cache=leiden_cache, verbose=verbose)
     
     return {
         "combined": combined_metrics,
@@ -759,11 +1092,13 @@ def analyze_position(fen: str) -> Dict[str, Dict[str, Any]]:
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    
     # Example FEN string
     fen = "rnbq1rk1/1pp2ppp/3pp3/pP6/2P5/P3PP2/2QP1P1P/R1B1KB1R b KQ - 0 11"
     
     # Run analysis
-    results = analyze_position(fen)
+    results = analyze_position(fen, verbose=True)
     
     # Total number of metrics computed
     metric_count = sum(len(metrics) for metrics in results.values())